@@ -0,0 +1,206 @@
+from __future__ import annotations
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from sqlalchemy.orm import Session
+
+from .records import EventRecord, decode_events
+
+# Raw ESPN scoreboard responses, gzip-compressed and content-addressed:
+#   <ARCHIVE_DIR>/blobs/ab/abcdef....json.gz   one file per distinct body (sha256)
+#   <ARCHIVE_DIR>/index.jsonl                  {"dates", "sha256", "fetched_at"} per new body
+# Set CBB_ARCHIVE_DIR="" to turn archiving off.
+ARCHIVE_DIR = os.environ.get("CBB_ARCHIVE_DIR", "./archive")
+
+# Records written per commit during replay
+DEFAULT_BATCH_SIZE = 1000
+
+_lock = threading.Lock()
+_latest: dict[str, dict[str, str]] = {}  # archive root -> {dates: sha256}
+
+
+def enabled() -> bool:
+    return bool(ARCHIVE_DIR)
+
+
+def _root(root: str | None) -> Path:
+    return Path(root or ARCHIVE_DIR)
+
+
+def _blob_path(root: Path, digest: str) -> Path:
+    return root / "blobs" / digest[:2] / f"{digest}.json.gz"
+
+
+def _latest_for(root: Path) -> dict[str, str]:
+    key = str(root.resolve())
+    if key not in _latest:
+        _latest[key] = {e["dates"]: e["sha256"] for e in iter_index(str(root))}
+    return _latest[key]
+
+
+def _record(root: Path, dates: str, digest: str) -> None:
+    # Only index a dates key when its body actually changed; identical polls cost nothing
+    with _lock:
+        latest = _latest_for(root)
+        if latest.get(dates) == digest:
+            return
+        entry = {"dates": dates, "sha256": digest, "fetched_at": datetime.now(timezone.utc).isoformat()}
+        with open(root / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        latest[dates] = digest
+
+
+class ArchiveWriter:
+    """
+    Hashes and compresses a response body as it is read, then files it under its digest.
+    Works for both whole bodies (write once) and streamed ones (write per chunk).
+    """
+
+    def __init__(self, dates: str, root: str | None = None) -> None:
+        self.dates = dates
+        self._root = _root(root)
+        (self._root / "blobs").mkdir(parents=True, exist_ok=True)
+        self._sha = hashlib.sha256()
+        fd, self._tmp = tempfile.mkstemp(dir=self._root / "blobs", suffix=".tmp")
+        self._gz = gzip.GzipFile(fileobj=os.fdopen(fd, "wb"), mode="wb", mtime=0)
+
+    def write(self, chunk: bytes) -> None:
+        self._sha.update(chunk)
+        self._gz.write(chunk)
+
+    def commit(self) -> str:
+        fileobj = self._gz.fileobj
+        self._gz.close()
+        fileobj.close()
+        digest = self._sha.hexdigest()
+        dest = _blob_path(self._root, digest)
+        if dest.exists():
+            os.unlink(self._tmp)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp, dest)
+        _record(self._root, self.dates, digest)
+        return digest
+
+    def abort(self) -> None:
+        fileobj = self._gz.fileobj
+        self._gz.close()
+        fileobj.close()
+        os.unlink(self._tmp)
+
+
+def store_payload(body: bytes, dates: str, root: str | None = None) -> str:
+    w = ArchiveWriter(dates, root)
+    w.write(body)
+    return w.commit()
+
+
+def iter_index(root: str | None = None) -> Iterator[dict[str, str]]:
+    path = _root(root) / "index.jsonl"
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_payload(digest: str, root: str | None = None) -> dict[str, Any]:
+    with gzip.open(_blob_path(_root(root), digest), "rb") as f:
+        return json.loads(f.read())
+
+
+def select_blobs(dates: list[str] | None = None, history: bool = False, root: str | None = None) -> list[str]:
+    """
+    Digests to replay, in fetch order. By default only the newest body per dates key
+    (enough to rebuild the current state); history=True replays every recorded version.
+    """
+    entries = [e for e in iter_index(root) if dates is None or e["dates"] in dates]
+    if not history:
+        newest = {e["dates"]: i for i, e in enumerate(entries)}
+        entries = [e for i, e in enumerate(entries) if newest[e["dates"]] == i]
+    return [e["sha256"] for e in entries]
+
+
+def _parse_blob(job: tuple[str, str | None]) -> tuple[int, list[EventRecord]]:
+    # Runs in a worker process: decompress, parse and decode one payload
+    digest, root = job
+    events = load_payload(digest, root).get("events") or []
+    return len(events), decode_events(events)
+
+
+def replay(
+    db: Session,
+    season: str,
+    dates: list[str] | None = None,
+    history: bool = False,
+    root: str | None = None,
+    workers: int = 0,
+    batch_size: int | None = DEFAULT_BATCH_SIZE,
+) -> dict[str, Any]:
+    """
+    Re-ingests archived payloads and runs the Elo pass once at the end, with no network.
+
+    workers > 1 decompresses and normalizes payloads in a process pool while this process
+    stays the single writer, applying each payload's records in fetch order as they arrive.
+    batch_size commits every N records so long replays don't hold the write lock throughout.
+    """
+    from .elo import apply_elo_to_final_games
+    from .ingest import ingest_records
+
+    digests = select_blobs(dates, history, root)
+    jobs = [(d, root) for d in digests]
+    seen = 0
+
+    def records_in_order(parsed: Iterator[tuple[int, list[EventRecord]]]) -> Iterator[list[EventRecord]]:
+        nonlocal seen
+        for n_events, records in parsed:
+            seen += n_events
+            yield records
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            totals = ingest_records(
+                db, records_in_order(pool.map(_parse_blob, jobs)), bulk=True, batch_size=batch_size
+            )
+    else:
+        totals = ingest_records(db, records_in_order(map(_parse_blob, jobs)), bulk=True, batch_size=batch_size)
+    totals["events_seen"] = seen
+    totals["changed_games"] = len(totals.pop("changed_game_ids"))
+    elo_stats = apply_elo_to_final_games(db, season=season)
+    return {"payloads": len(digests), "ingest": totals, "elo": elo_stats}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.archive")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("replay", help="rebuild games and ratings from archived payloads")
+    rp.add_argument("--season", default="2025-26")
+    rp.add_argument("--dates", action="append", help="only these dates keys (repeatable)")
+    rp.add_argument("--history", action="store_true", help="replay every archived version, not just the newest")
+    rp.add_argument("--root", default=None, help="archive directory (default: CBB_ARCHIVE_DIR)")
+    rp.add_argument("--workers", type=int, default=0, help="parse payloads in this many processes")
+    rp.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="commit every N records (0: once)")
+    args = parser.parse_args(argv)
+
+    from .db import SessionLocal, init_db
+    init_db()
+    db = SessionLocal()
+    try:
+        print(json.dumps(replay(db, args.season, args.dates, args.history, args.root, args.workers, args.batch_size or None)))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .db import chunks
+from .elo import apply_elo_to_final_games
+from .espn_client import close_client, iter_days, split_dates
+from .ingest import ingest_scoreboard_json
+from .days import frozen_days
+from .models import BackfillCheckpoint
+from .seasons import season_dates
+
+# Days fetched at once (each still goes through the shared ESPN rate limit)
+BACKFILL_CONCURRENCY = 4
+
+
+def _completed(db: Session, days: list[str]) -> set[str]:
+    done: set[str] = set()
+    for chunk in chunks(days):
+        done.update(db.execute(select(BackfillCheckpoint.day).where(BackfillCheckpoint.day.in_(chunk))).scalars())
+    return done
+
+
+def progress(db: Session, season: str, dates: str | None = None) -> dict[str, Any]:
+    days = split_dates(dates or season_dates(season))
+    done = _completed(db, days)
+    return {"days": len(days), "completed": len(done), "remaining": len(days) - len(done)}
+
+
+async def backfill(
+    db: Session,
+    season: str,
+    dates: str | None = None,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    restart: bool = False,
+    batch_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Fetches and ingests every day of `dates` (default: the whole season), `concurrency`
+    days in flight, checkpointing each day once its ingest has committed. A rerun after a
+    crash picks up the days without a checkpoint and skips frozen days (all final and
+    rated); restart=True forgets the checkpoints and refetches everything.
+
+    Elo runs once at the end, over every final not yet applied, so an interrupted run that
+    never reached it still gets rated by the next one.
+    """
+    days = split_dates(dates or season_dates(season))
+    if restart:
+        for chunk in chunks(days):
+            db.execute(delete(BackfillCheckpoint).where(BackfillCheckpoint.day.in_(chunk)))
+        db.commit()
+    done: set[str] = set() if restart else _completed(db, days) | frozen_days(db, days)
+    todo = [d for d in days if d not in done]
+
+    stats: dict[str, Any] = {
+        "days": len(days),
+        "skipped": len(done),
+        "fetched": 0,
+        "events": 0,
+        "inserted": 0,
+        "updated": 0,
+    }
+    async for day, payload in iter_days(todo, concurrency):
+        ingest_stats = ingest_scoreboard_json(db, payload, bulk=True, batch_size=batch_size)
+        db.merge(BackfillCheckpoint(
+            day=day,
+            season=season,
+            events=ingest_stats["events_seen"],
+            completed_at_utc=datetime.utcnow(),
+        ))
+        db.commit()
+        stats["fetched"] += 1
+        stats["events"] += ingest_stats["events_seen"]
+        stats["inserted"] += ingest_stats["inserted"]
+        stats["updated"] += ingest_stats["updated"]
+
+    stats["elo"] = apply_elo_to_final_games(db, season=season)
+    return stats
+
+
+async def _run(db: Session, args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        return await backfill(db, args.season, args.dates, args.concurrency, args.restart, args.batch_size or None)
+    finally:
+        await close_client()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.backfill")
+    parser.add_argument("--season", default="2025-26")
+    parser.add_argument("--dates", default=None, help="YYYYMMDD-YYYYMMDD (default: the whole season)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY)
+    parser.add_argument("--restart", action="store_true", help="ignore existing checkpoints")
+    parser.add_argument("--batch-size", type=int, default=0, help="commit every N events (0: once per day)")
+    args = parser.parse_args(argv)
+
+    from .db import SessionLocal, init_db
+    init_db()
+    db = SessionLocal()
+    try:
+        print(json.dumps(asyncio.run(_run(db, args))))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+# Load generator for the update path. Run the API against app/fake_espn.py (see there),
+# then e.g.:
+#   python -m app.bench --api http://127.0.0.1:8000 --requests 200 --concurrency 8 --days 30
+# Each request is an /admin/update_sync for a different day (cycling through --days from
+# --start), with force=1 so conditional requests and coalescing don't hide the work.
+# The client-side ESPN rate limit (ESPN_RATE_LIMIT) applies to the fake too; raise it on
+# the API process to measure the app rather than the limiter.
+
+
+def _percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, round(p / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+async def run(
+    api: str,
+    requests: int,
+    concurrency: int,
+    start: str,
+    days: int,
+    split_days: bool = False,
+    span: int = 1,
+) -> dict:
+    first = datetime.strptime(start, "%Y%m%d").date()
+    jobs: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        jobs.put_nowait(i)
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while True:
+            try:
+                i = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            d0 = first + timedelta(days=i % days)
+            d1 = d0 + timedelta(days=span - 1)
+            dates = d0.strftime("%Y%m%d") if span == 1 else f"{d0:%Y%m%d}-{d1:%Y%m%d}"
+            params = {"dates": dates, "force": "true", "split_days": str(split_days).lower()}
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(f"{api}/admin/update_sync", params=params)
+                if r.status_code != 200:
+                    errors[str(r.status_code)] = errors.get(str(r.status_code), 0) + 1
+                    continue
+            except httpx.HTTPError as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+
+    t_start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=httpx.Timeout(300.0)) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t_start
+
+    lat = sorted(latencies)
+    return {
+        "requests": requests,
+        "ok": len(lat),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(lat) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(lat, 50) * 1000, 1),
+            "p90": round(_percentile(lat, 90) * 1000, 1),
+            "p99": round(_percentile(lat, 99) * 1000, 1),
+            "max": round(lat[-1] * 1000, 1) if lat else 0.0,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.bench")
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--start", default="20251103", help="first YYYYMMDD")
+    parser.add_argument("--days", type=int, default=30, help="cycle through this many days")
+    parser.add_argument("--span", type=int, default=1, help="days per request")
+    parser.add_argument("--split-days", action="store_true")
+    args = parser.parse_args(argv)
+    stats = asyncio.run(
+        run(args.api, args.requests, args.concurrency, args.start, args.days, args.split_days, args.span)
+    )
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+from typing import Any, Iterable
+from sqlalchemy import select, exists, update, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased
+
+from .db import chunks
+from .espn_client import fetch_game_summaries
+from .models import Game, Team, TeamBoxScore
+from .records import safe_int
+
+BOX_SCORE_CONCURRENCY = 8
+
+# Finals whose summary fetch failed are retried by later updates this many times
+BOX_SCORE_MAX_RETRIES = 5
+
+_COLUMNS = ("fgm", "fga", "fg3m", "fg3a", "ftm", "fta", "oreb", "dreb", "reb", "tov")
+
+# ESPN statistic name -> column(s). Made-attempted pairs arrive as "25-60".
+_PAIRS = {
+    "fieldGoalsMade-fieldGoalsAttempted": ("fgm", "fga"),
+    "threePointFieldGoalsMade-threePointFieldGoalsAttempted": ("fg3m", "fg3a"),
+    "freeThrowsMade-freeThrowsAttempted": ("ftm", "fta"),
+}
+_SINGLES = {
+    "offensiveRebounds": "oreb",
+    "defensiveRebounds": "dreb",
+    "totalRebounds": "reb",
+}
+
+
+def parse_team_box_scores(summary: dict[str, Any]) -> dict[str, dict[str, int | None]]:
+    """
+    {provider_team_id: {fgm, fga, ..., tov}} from an ESPN game summary payload.
+    """
+    out: dict[str, dict[str, int | None]] = {}
+    for t in (summary.get("boxscore") or {}).get("teams") or []:
+        provider_team_id = str((t.get("team") or {}).get("id", "")).strip()
+        if not provider_team_id:
+            continue
+        row: dict[str, int | None] = dict.fromkeys(_COLUMNS)
+        for st in t.get("statistics") or []:
+            name = st.get("name")
+            value = st.get("displayValue")
+            if name in _PAIRS:
+                made, _, att = str(value or "").partition("-")
+                made_col, att_col = _PAIRS[name]
+                row[made_col] = safe_int(made)
+                row[att_col] = safe_int(att)
+            elif name in _SINGLES:
+                row[_SINGLES[name]] = safe_int(value)
+            elif name == "totalTurnovers":
+                # includes team turnovers; preferred over "turnovers" when present
+                row["tov"] = safe_int(value)
+            elif name == "turnovers" and row["tov"] is None:
+                row["tov"] = safe_int(value)
+        out[provider_team_id] = row
+    return out
+
+
+def _games_missing_box_scores(db: Session, game_ids: list[int] | None) -> list[tuple]:
+    """
+    (Game.id, provider_game_id, {provider_team_id: Team.id}) for finals without box scores,
+    among game_ids (plus earlier failures still under the retry limit) or across the whole
+    table when game_ids is None.
+    """
+    home = aliased(Team)
+    away = aliased(Team)
+    q = (
+        select(
+            Game.id, Game.provider_game_id,
+            home.provider_team_id, Game.home_team_id,
+            away.provider_team_id, Game.away_team_id,
+        )
+        .join(home, home.id == Game.home_team_id)
+        .join(away, away.id == Game.away_team_id)
+        .where(Game.status == "final", ~exists().where(TeamBoxScore.game_id == Game.id))
+    )
+    if game_ids is None:
+        queries = [q]
+    else:
+        queries = [q.where(Game.id.in_(chunk)) for chunk in chunks(game_ids)]
+        queries.append(q.where(Game.box_score_failures.between(1, BOX_SCORE_MAX_RETRIES - 1)))
+    out: dict[int, tuple] = {}
+    for query in queries:
+        for gid, pgid, h_ptid, h_id, a_ptid, a_id in db.execute(query).tuples():
+            out[gid] = (gid, pgid, {h_ptid: h_id, a_ptid: a_id})
+    return list(out.values())
+
+
+async def fetch_box_scores(
+    db: Session, game_ids: Iterable[int] | None = None, concurrency: int = BOX_SCORE_CONCURRENCY
+) -> dict[str, int]:
+    """
+    For the given games (typically ingest's changed_game_ids), fetches summaries of those
+    that are final and have no box score yet, `concurrency` at a time, and stores team totals.
+    Failed fetches are counted on the game and retried by later calls, up to
+    BOX_SCORE_MAX_RETRIES; game_ids=None sweeps every final still missing one.
+    """
+    pending = _games_missing_box_scores(db, None if game_ids is None else list(game_ids))
+    if not pending:
+        return {"games_pending": 0, "fetched": 0, "failed": 0, "team_rows": 0}
+
+    summaries = await fetch_game_summaries([pgid for _, pgid, _ in pending], concurrency=concurrency)
+
+    rows = []
+    failed: list[int] = []
+    for gid, pgid, team_ids in pending:
+        summary = summaries.get(pgid)
+        if isinstance(summary, Exception) or summary is None:
+            failed.append(gid)
+            continue
+        game_rows = [
+            {"game_id": gid, "team_id": team_ids[provider_team_id], **totals}
+            for provider_team_id, totals in parse_team_box_scores(summary).items()
+            if provider_team_id in team_ids
+        ]
+        if not game_rows:
+            # ESPN can serve a summary without team totals right after the final; retry later
+            failed.append(gid)
+            continue
+        rows.extend(game_rows)
+
+    if rows:
+        stmt = sqlite_insert(TeamBoxScore)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TeamBoxScore.game_id, TeamBoxScore.team_id],
+            set_={c: stmt.excluded[c] for c in _COLUMNS},
+        )
+        db.execute(stmt, rows)
+    for chunk in chunks(failed):
+        db.execute(
+            update(Game)
+            .where(Game.id.in_(chunk))
+            .values(box_score_failures=func.coalesce(Game.box_score_failures, 0) + 1)
+        )
+    if rows or failed:
+        db.commit()
+
+    return {
+        "games_pending": len(pending),
+        "fetched": len(pending) - len(failed),
+        "failed": len(failed),
+        "team_rows": len(rows),
+    }
@@ -0,0 +1,83 @@
+from __future__ import annotations
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .db import chunks
+from .models import FrozenDay, Game
+
+# ESPN's scoreboard days are US Eastern; the season is almost entirely EST, and a fixed
+# offset keeps this free of tz data. A 9pm ET tip (02:00Z next day) maps back correctly.
+ESPN_DAY_OFFSET_HOURS = 5
+_ESPN_DAY_OFFSET = timedelta(hours=ESPN_DAY_OFFSET_HOURS)
+
+# Game.start_time_utc -> YYYYMMDD scoreboard day, in SQL
+_day_expr = func.strftime("%Y%m%d", Game.start_time_utc, f"-{ESPN_DAY_OFFSET_HOURS} hours")
+
+
+def as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def espn_day(start_time_utc: datetime) -> date:
+    return (as_utc(start_time_utc) - _ESPN_DAY_OFFSET).date()
+
+
+def days_of_games(db: Session, game_ids: Iterable[int]) -> set[str]:
+    out: set[str] = set()
+    for chunk in chunks(list(game_ids)):
+        out.update(
+            d for d in db.execute(select(_day_expr).where(Game.id.in_(chunk)).distinct()).scalars()
+            if d is not None
+        )
+    return out
+
+
+def frozen_days(db: Session, days: Iterable[str]) -> set[str]:
+    out: set[str] = set()
+    for chunk in chunks(list(days)):
+        out.update(db.execute(select(FrozenDay.day).where(FrozenDay.day.in_(chunk))).scalars())
+    return out
+
+
+def thaw_days(db: Session, game_ids: Iterable[int]) -> None:
+    """Drop the markers of the days these (just changed) games belong to."""
+    days = list(days_of_games(db, game_ids))
+    for chunk in chunks(days):
+        db.execute(delete(FrozenDay).where(FrozenDay.day.in_(chunk)))
+
+
+def refresh_days(db: Session, days: Iterable[str] | None = None) -> int:
+    """
+    Recomputes the markers for `days` (None: every day with games) from the games table,
+    freezing days whose games are all final and rated and thawing the rest. Does not
+    commit. Returns the number of days frozen.
+    """
+    unsettled = func.sum(case((and_(Game.status == "final", Game.elo_applied.is_(True)), 0), else_=1))
+    q = select(_day_expr, func.count(), unsettled).where(Game.start_time_utc.is_not(None)).group_by(_day_expr)
+    wanted = None if days is None else list(days)
+    rows = []
+    if wanted is None:
+        rows = db.execute(q).all()
+    else:
+        for chunk in chunks(wanted):
+            rows.extend(db.execute(q.where(_day_expr.in_(chunk))).all())
+
+    frozen = [{"day": d, "games": n} for d, n, open_ in rows if n and not open_]
+    thawed = [d for d, n, open_ in rows if open_]
+    if wanted is not None:
+        seen = {d for d, _, _ in rows}
+        thawed.extend(d for d in wanted if d not in seen)
+
+    if frozen:
+        stmt = sqlite_insert(FrozenDay)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FrozenDay.day], set_={"games": stmt.excluded.games}
+        )
+        db.execute(stmt, frozen)
+    for chunk in chunks(thawed):
+        db.execute(delete(FrozenDay).where(FrozenDay.day.in_(chunk)))
+    return len(frozen)
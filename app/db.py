@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from typing import Iterator
+
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 DB_URL = "sqlite:///./cbb.db"
@@ -11,6 +13,16 @@ engine = create_engine(
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
+# SQLite caps bound parameters per statement; keep IN (...) lists well under it.
+IN_CHUNK = 500
+
+
+def chunks(xs: list, n: int = IN_CHUNK) -> Iterator[list]:
+    """Consecutive slices of `xs`, `n` at a time (for IN lists)."""
+    for i in range(0, len(xs), n):
+        yield xs[i:i + n]
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -21,3 +33,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def init_db() -> None:
+    """
+    create_all, plus ADD COLUMN / CREATE INDEX for anything added to a table after it was
+    first created (create_all never alters existing tables). New columns must be nullable.
+
+    Seasons rated before the margin-of-victory engine existed get their MOV ratings built
+    from the finals applied so far (elo.seed_mov), decided from the data rather than from
+    which columns were just added, so an interrupted seed is finished on the next start.
+    """
+    from . import models  # noqa: F401  (registers tables on Base.metadata)
+
+    Base.metadata.create_all(bind=engine)
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in existing:
+                    ddl = col.type.compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl}")
+            for idx in table.indexes:
+                idx.create(conn, checkfirst=True)
+
+    from .elo import seasons_missing_mov, seed_mov
+
+    db = SessionLocal()
+    try:
+        for season in seasons_missing_mov(db):
+            seed_mov(db, season)
+    finally:
+        db.close()
@@ -1,11 +1,19 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 from math import pow
-from datetime import datetime
+from datetime import datetime, time, timedelta
+from time import perf_counter
+from typing import Any, Iterable, Sequence
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, tuple_, update
 
-from .models import TeamRating, Game
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .db import chunks
+from .models import TeamRating, TeamMovRating, Game, RatingHistory
+from .days import days_of_games, refresh_days
+from .seasons import season_span
 
 
 DEFAULT_ELO = 1500.0
@@ -20,13 +28,93 @@ def expected_score(r_a: float, r_b: float) -> float:
     return 1.0 / (1.0 + pow(10.0, (r_b - r_a) / 400.0))
 
 
+@dataclass(frozen=True)
+class EloParams:
+    """Every knob of the win/loss Elo update, so alternatives can be run side by side."""
+
+    k_base: float = K_BASE
+    home_advantage: float = HOME_ADVANTAGE_ELO
+    early_games: int = 10  # K is boosted below this many games played...
+    early_mult: float = 1.25
+    late_games: int = 25  # ...and damped from this many on
+    late_mult: float = 0.85
+    initial: float = DEFAULT_ELO
+
+    def k(self, games_played: int) -> float:
+        # Higher K early season, lower later
+        if games_played < self.early_games:
+            return self.k_base * self.early_mult
+        if games_played < self.late_games:
+            return self.k_base
+        return self.k_base * self.late_mult
+
+
+DEFAULT_PARAMS = EloParams()
+
+
 def k_factor(games_played: int) -> float:
-    # Higher K early season, lower later
-    if games_played < 10:
-        return K_BASE * 1.25
-    if games_played < 25:
-        return K_BASE
-    return K_BASE * 0.85
+    return DEFAULT_PARAMS.k(games_played)
+
+
+def game_result(home_score: int, away_score: int) -> float:
+    if home_score > away_score:
+        return 1.0
+    if home_score < away_score:
+        return 0.0
+    return 0.5
+
+
+def play_game(
+    p: EloParams, home_elo: float, home_gp: int, away_elo: float, away_gp: int, s_home: float, neutral: bool
+) -> tuple[float, float]:
+    """
+    Post-game (home_elo, away_elo) for one final; s_home is 1/0.5/0 from game_result.
+    """
+    # Home advantage (skip if neutral)
+    home_adj = 0.0 if neutral else p.home_advantage
+    e_home = expected_score(home_elo + home_adj, away_elo)
+    e_away = 1.0 - e_home
+    return (
+        home_elo + p.k(home_gp) * (s_home - e_home),
+        away_elo + p.k(away_gp) * ((1.0 - s_home) - e_away),
+    )
+
+
+@dataclass(frozen=True)
+class MovParams:
+    """
+    Margin-of-victory Elo: the update is scaled by ((margin + mov_offset) ** mov_exp),
+    divided by (ac_base + ac_scale * winner's pregame Elo edge) so favourites' blowouts
+    count for less (autocorrelation correction). Zero-sum, single K.
+    """
+
+    k: float = K_BASE
+    home_advantage: float = HOME_ADVANTAGE_ELO
+    mov_offset: float = 3.0
+    mov_exp: float = 0.8
+    ac_base: float = 7.5
+    ac_scale: float = 0.006
+    initial: float = DEFAULT_ELO
+
+
+DEFAULT_MOV_PARAMS = MovParams()
+
+# Rating engines served by /ratings and /predict
+ENGINES = ("elo", "mov")
+
+
+def play_game_mov(
+    p: MovParams, home_elo: float, away_elo: float, home_score: int, away_score: int, neutral: bool
+) -> tuple[float, float]:
+    """Post-game (home_elo, away_elo) for one final under the margin-of-victory engine."""
+    home_adj = 0.0 if neutral else p.home_advantage
+    edge = home_elo + home_adj - away_elo
+    e_home = expected_score(home_elo + home_adj, away_elo)
+    s_home = game_result(home_score, away_score)
+    winner_edge = edge if home_score > away_score else -edge if home_score < away_score else 0.0
+    mult = (abs(home_score - away_score) + p.mov_offset) ** p.mov_exp / max(p.ac_base + p.ac_scale * winner_edge, 1.0)
+    delta = p.k * mult * (s_home - e_home)
+    return home_elo + delta, away_elo - delta
 
 
 def get_or_create_rating(db: Session, team_id: int, season: str) -> TeamRating:
@@ -41,52 +129,567 @@ def get_or_create_rating(db: Session, team_id: int, season: str) -> TeamRating:
     return r
 
 
-def apply_elo_to_final_games(db: Session, season: str) -> dict[str, int]:
+def _load_ratings(db: Session, season: str, mov_params: MovParams = DEFAULT_MOV_PARAMS) -> dict[int, list]:
     """
-    Finds games that are final and not yet elo_applied, applies updates, and marks them applied.
+    team_id -> [elo, games_played, mov_elo] for every rating row of the season, one query
+    per engine. Teams without a MOV row yet start it at mov_params.initial.
     """
-    games = db.execute(
-        select(Game).where(Game.status == "final", Game.elo_applied == False)  # noqa: E712
-    ).scalars().all()
+    mov = dict(
+        db.execute(select(TeamMovRating.team_id, TeamMovRating.elo).where(TeamMovRating.season == season)).all()
+    )
+    rows = db.execute(
+        select(TeamRating.team_id, TeamRating.elo, TeamRating.games_played).where(TeamRating.season == season)
+    )
+    return {
+        team_id: [elo, games_played, mov.get(team_id, mov_params.initial)]
+        for team_id, elo, games_played in rows
+    }
 
-    applied = 0
 
-    for g in games:
-        if g.home_score is None or g.away_score is None:
+def _save_ratings(db: Session, season: str, state: dict[int, list], touched: set[int], new: set[int]) -> None:
+    """
+    Writes the touched ratings back: one executemany UPDATE by key and one INSERT for new
+    teams, plus one upsert for the MOV engine.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"team_id": t, "elo": state[t][0], "games_played": state[t][1], "last_updated_utc": now}
+        for t in touched
+    ]
+    existing = [r for r in rows if r["team_id"] not in new]
+    created = [{**r, "season": season} for r in rows if r["team_id"] in new]
+    if existing:
+        db.execute(update(TeamRating), existing)
+    if created:
+        db.execute(insert(TeamRating), created)
+    if rows:
+        stmt = sqlite_insert(TeamMovRating)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TeamMovRating.team_id, TeamMovRating.season],
+            set_={c: stmt.excluded[c] for c in ("elo", "games_played", "last_updated_utc")},
+        )
+        db.execute(stmt, [{**r, "season": season, "elo": state[r["team_id"]][2]} for r in rows])
+
+
+def _history_row(
+    game_id: int, team_id: int, season: str, played_at: datetime,
+    pre: float, post: float, games_played: int, score_for: int, score_against: int,
+    mov_pre: float, mov_post: float, home: bool, neutral_site: bool,
+) -> dict:
+    return {
+        "game_id": game_id, "team_id": team_id, "season": season, "played_at_utc": played_at,
+        "elo_pre": pre, "elo_post": post, "games_played": games_played,
+        "score_for": score_for, "score_against": score_against,
+        "mov_pre": mov_pre, "mov_post": mov_post, "home": home, "neutral_site": neutral_site,
+    }
+
+
+def _save_history(db: Session, rows: list[dict]) -> None:
+    if not rows:
+        return
+    stmt = sqlite_insert(RatingHistory)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RatingHistory.game_id, RatingHistory.team_id],
+        set_={c: stmt.excluded[c] for c in rows[0] if c not in ("game_id", "team_id")},
+    )
+    db.execute(stmt, rows)
+
+
+def _chronological(row) -> tuple:
+    # start time, then game id: a stable order no matter how rows came back
+    st = row.start_time_utc
+    return (st is None, st or datetime.min, row.id)
+
+
+def _play(
+    rows: Iterable[tuple],
+    state: dict[int, list],
+    season: str,
+    params: EloParams,
+    mov_params: MovParams = DEFAULT_MOV_PARAMS,
+) -> tuple[list[int], list[dict], set[int]]:
+    """
+    Applies finals (id, start, home, away, home_score, away_score, neutral), in the order
+    given, to `state` (team_id -> [elo, games_played, mov_elo], grown for new teams),
+    both engines in the same pass. Returns (applied game ids, rating_history rows, team
+    ids touched).
+    """
+    done: list[int] = []
+    history: list[dict] = []
+    touched: set[int] = set()
+    now = datetime.utcnow()
+
+    for gid, start, home_id, away_id, home_score, away_score, neutral_site in rows:
+        if home_score is None or away_score is None:
             continue
 
-        home = get_or_create_rating(db, g.home_team_id, season)
-        away = get_or_create_rating(db, g.away_team_id, season)
+        home = state.setdefault(home_id, [params.initial, 0, mov_params.initial])
+        away = state.setdefault(away_id, [params.initial, 0, mov_params.initial])
+        home_pre, away_pre = home[0], away[0]
+        home_mov_pre, away_mov_pre = home[2], away[2]
+
+        home[0], away[0] = play_game(
+            params, home[0], home[1], away[0], away[1], game_result(home_score, away_score), neutral_site
+        )
+        home[2], away[2] = play_game_mov(mov_params, home[2], away[2], home_score, away_score, neutral_site)
+        home[1] += 1
+        away[1] += 1
+        touched.add(home_id)
+        touched.add(away_id)
+
+        played_at = start or now
+        history.append(_history_row(
+            gid, home_id, season, played_at, home_pre, home[0], home[1], home_score, away_score,
+            home_mov_pre, home[2], True, bool(neutral_site),
+        ))
+        history.append(_history_row(
+            gid, away_id, season, played_at, away_pre, away[0], away[1], away_score, home_score,
+            away_mov_pre, away[2], False, bool(neutral_site),
+        ))
+        done.append(gid)
+
+    return done, history, touched
+
+
+def _pending_finals(db: Session, season: str) -> list:
+    # Only the season's date span, the same games replay_season and the rollback rate
+    lo, hi = _season_bounds(season)
+    games = db.execute(
+        select(
+            Game.id, Game.start_time_utc, Game.home_team_id, Game.away_team_id,
+            Game.home_score, Game.away_score, Game.neutral_site,
+        ).where(
+            Game.status == "final",
+            Game.elo_applied == False,  # noqa: E712
+            Game.start_time_utc >= lo,
+            Game.start_time_utc < hi,
+        )
+    ).all()
+    games.sort(key=_chronological)
+    return games
+
+
+def apply_elo_to_final_games(
+    db: Session,
+    season: str,
+    game_ids: Iterable[int] | None = None,
+    params: EloParams = DEFAULT_PARAMS,
+    mov_params: MovParams = DEFAULT_MOV_PARAMS,
+) -> dict[str, Any]:
+    """
+    Finds games in the season's date span that are final and not yet elo_applied (games
+    outside it belong to another season and are left alone), applies updates in start-time
+    order, marks them applied and appends both teams' pre/post ratings to rating_history.
+    The margin-of-victory engine (TeamMovRating) is updated in the same pass.
+
+    game_ids (e.g. ingest's changed_game_ids) limits the correction check and the frozen-day
+    refresh to those games. Unapplied finals are always found with the (indexed) full scan,
+    so finals left unrated by an earlier run that failed after ingest committed are retried
+    even though ingest no longer reports them as changed.
+
+    If a final arrived late (it sorts before games already rated) or an applied final's
+    score was corrected, the season is rolled back to just before the earliest such game
+    and only the games from there on are replayed (see _rollback_and_replay).
+
+    The season's ratings are loaded once and updated in memory; changes go back in a
+    couple of set-based statements instead of a lookup (and maybe a flush) per team per game.
+    """
+    games = _pending_finals(db, season)
+    ids = None if game_ids is None else sorted(set(game_ids) | {g.id for g in games})
+    stats: dict[str, Any] = {"final_games_found": len(games), "elo_games_applied": 0}
+
+    point = _rollback_point(db, season, ids, games)
+    if point is not None:
+        stats["rollback"] = _rollback_and_replay(db, season, point, params, mov_params)
+        stats["elo_games_applied"] += stats["rollback"]["games_replayed"]
+        # Anything the replay didn't cover still goes incrementally
+        games = _pending_finals(db, season)
+
+    state = _load_ratings(db, season, mov_params)
+    existing = set(state)
+    done, history, touched = _play(games, state, season, params, mov_params)
+
+    _save_ratings(db, season, state, touched, touched - existing)
+    _save_history(db, history)
+    _mark_applied(db, done)
+    stats["elo_games_applied"] += len(done)
+
+    # Days whose games are now all final and rated stop being fetched
+    refresh_days(db, None if ids is None else days_of_games(db, ids))
+    db.commit()
+    return stats
+
+
+def _rollback_point(db: Session, season: str, ids: list[int] | None, pending: list) -> tuple[datetime, int] | None:
+    """
+    (start_time_utc, game id) of the earliest game that invalidates ratings already
+    applied this season, or None:
+      - a pending final that sorts before the last game in rating_history, or
+      - an applied game that no longer matches the result that was applied (status,
+        score, teams, home/away side, neutral site or start time). Its point is the earlier of its recorded position
+        and its new start time, so both the old and the new place get replayed.
+    """
+    lo, hi = _season_bounds(season)
+    candidates: list[tuple[datetime, int]] = []
+
+    last = db.execute(
+        select(RatingHistory.played_at_utc, RatingHistory.game_id)
+        .where(RatingHistory.season == season)
+        .order_by(RatingHistory.played_at_utc.desc(), RatingHistory.game_id.desc())
+        .limit(1)
+    ).first()
+    if last is not None:
+        last_key = (last[0], last[1])
+        for r in pending:
+            st = r.start_time_utc
+            if st is None or r.home_score is None or r.away_score is None or not lo <= st < hi:
+                continue
+            if (st, r.id) < last_key:
+                candidates.append((st, r.id))
+
+    # Each team's history row is checked against its side of the game as it is now
+    as_home = RatingHistory.team_id == Game.home_team_id
+    as_away = RatingHistory.team_id == Game.away_team_id
+    q = (
+        select(RatingHistory.played_at_utc, Game.start_time_utc, Game.id)
+        .join(Game, Game.id == RatingHistory.game_id)
+        .where(
+            RatingHistory.season == season,
+            or_(
+                Game.status != "final",
+                Game.home_score.is_(None),
+                Game.away_score.is_(None),
+                and_(~as_home, ~as_away),
+                and_(as_home, or_(RatingHistory.score_for != Game.home_score,
+                                  RatingHistory.score_against != Game.away_score,
+                                  RatingHistory.home.is_(False))),
+                and_(as_away, or_(RatingHistory.score_for != Game.away_score,
+                                  RatingHistory.score_against != Game.home_score,
+                                  RatingHistory.home.is_(True))),
+                RatingHistory.neutral_site != Game.neutral_site,
+                RatingHistory.played_at_utc != Game.start_time_utc,
+            ),
+        )
+    )
+    if ids is None:
+        changed = db.execute(q).all()
+    else:
+        changed = []
+        for chunk in chunks(ids):
+            changed.extend(db.execute(q.where(RatingHistory.game_id.in_(chunk))).all())
+    for played_at, start, gid in changed:
+        candidates.append((min(played_at, start) if start is not None else played_at, gid))
+
+    return min(candidates) if candidates else None
 
-        # Result
-        if g.home_score > g.away_score:
-            s_home = 1.0
-        elif g.home_score < g.away_score:
-            s_home = 0.0
-        else:
-            s_home = 0.5
 
-        # Home advantage (skip if neutral)
-        home_adj = 0.0 if g.neutral_site else HOME_ADVANTAGE_ELO
+def _history_covers(db: Session, season: str) -> bool:
+    """True if rating_history has rows for every applied final of the season."""
+    lo, hi = _season_bounds(season)
+    applied = db.execute(
+        select(func.count()).select_from(Game).where(
+            Game.elo_applied.is_(True), Game.start_time_utc >= lo, Game.start_time_utc < hi
+        )
+    ).scalar_one()
+    recorded = db.execute(
+        select(func.count(func.distinct(RatingHistory.game_id))).where(RatingHistory.season == season)
+    ).scalar_one()
+    return recorded >= applied
 
-        e_home = expected_score(home.elo + home_adj, away.elo)
-        e_away = 1.0 - e_home
 
-        k_h = k_factor(home.games_played)
-        k_a = k_factor(away.games_played)
+def _history_complete(db: Session, season: str) -> bool:
+    # Rows from before the MOV engine can't restore its state
+    without_mov = db.execute(
+        select(func.count()).select_from(RatingHistory).where(
+            RatingHistory.season == season, RatingHistory.mov_post.is_(None)
+        )
+    ).scalar_one()
+    return not without_mov and _history_covers(db, season)
 
-        # Update
-        home.elo = home.elo + k_h * (s_home - e_home)
-        away.elo = away.elo + k_a * ((1.0 - s_home) - e_away)
 
-        home.games_played += 1
-        away.games_played += 1
-        now = datetime.utcnow()
-        home.last_updated_utc = now
-        away.last_updated_utc = now
+def _rollback_and_replay(
+    db: Session, season: str, point: tuple[datetime, int], params: EloParams, mov_params: MovParams
+) -> dict[str, Any]:
+    """
+    Restores every team to its rating just before `point` (its last rating_history row
+    before it: pre-game ratings double as checkpoints) and replays only the season's
+    finals from `point` on. Falls back to a full replay_season if history doesn't cover
+    every applied game (e.g. a database rated before history existed). Does not commit.
+    """
+    if not _history_complete(db, season):
+        stats = replay_season(db, season, params, mov_params)
+        return {"from_game_id": point[1], "games_replayed": stats["games_replayed"], "full_replay": True}
+
+    hist_key = tuple_(RatingHistory.played_at_utc, RatingHistory.game_id)
+    rn = func.row_number().over(
+        partition_by=RatingHistory.team_id,
+        order_by=(RatingHistory.played_at_utc.desc(), RatingHistory.game_id.desc()),
+    )
+    before = (
+        select(
+            RatingHistory.team_id, RatingHistory.elo_post, RatingHistory.games_played, RatingHistory.mov_post,
+            rn.label("rn"),
+        )
+        .where(RatingHistory.season == season, hist_key < point)
+        .subquery()
+    )
+    state = {
+        team_id: [elo, gp, mov]
+        for team_id, elo, gp, mov in db.execute(
+            select(before.c.team_id, before.c.elo_post, before.c.games_played, before.c.mov_post)
+            .where(before.c.rn == 1)
+        )
+    }
+    # Everyone rated after the point is rewound, even if none of their games replay
+    rewound = set(db.execute(
+        select(RatingHistory.team_id).where(RatingHistory.season == season, hist_key >= point).distinct()
+    ).scalars())
+    existing = set(_load_ratings(db, season))
+
+    suffix = season_finals(db, season, since=point)
+    done, history, touched = _play(suffix, state, season, params, mov_params)
+    for team_id in rewound - touched:
+        state.setdefault(team_id, [params.initial, 0, mov_params.initial])
+    touched |= rewound
+
+    # Games whose history goes are unapplied too, even if they moved out of the replayed span
+    dropped = list(db.execute(
+        select(RatingHistory.game_id).where(RatingHistory.season == season, hist_key >= point).distinct()
+    ).scalars())
+    db.execute(delete(RatingHistory).where(RatingHistory.season == season, hist_key >= point))
+    _save_history(db, history)
+    _save_ratings(db, season, state, touched, touched - existing)
+    lo, hi = _season_bounds(season)
+    db.execute(
+        update(Game)
+        .where(Game.start_time_utc >= lo, Game.start_time_utc < hi, tuple_(Game.start_time_utc, Game.id) >= point)
+        .values(elo_applied=False)
+        .execution_options(synchronize_session=False)
+    )
+    _mark_applied(db, dropped, applied=False)
+    _mark_applied(db, done)
+    return {"from_game_id": point[1], "games_replayed": len(done), "full_replay": False}
+
+
+def _mark_applied(db: Session, game_ids: list[int], applied: bool = True) -> None:
+    for chunk in chunks(game_ids):
+        db.execute(
+            update(Game)
+            .where(Game.id.in_(chunk))
+            .values(elo_applied=applied)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _season_bounds(season: str) -> tuple[datetime, datetime]:
+    """[first day 00:00, day after the last 00:00) of the season, naive UTC like the column."""
+    start, end = season_span(season)
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def season_finals(db: Session, season: str, since: tuple[datetime, int] | None = None) -> list[tuple]:
+    """
+    (id, start_time_utc, home_team_id, away_team_id, home_score, away_score, neutral_site)
+    for every scored final in the season's date span, in replay order: start time, then id.
+    since=(start_time_utc, id) keeps only games from that point on.
+    """
+    lo, hi = _season_bounds(season)
+    q = (
+        select(
+            Game.id, Game.start_time_utc, Game.home_team_id, Game.away_team_id,
+            Game.home_score, Game.away_score, Game.neutral_site,
+        )
+        .where(
+            Game.status == "final",
+            Game.home_score.is_not(None),
+            Game.away_score.is_not(None),
+            Game.start_time_utc >= lo,
+            Game.start_time_utc < hi,
+        )
+        .order_by(Game.start_time_utc, Game.id)
+    )
+    if since is not None:
+        q = q.where(tuple_(Game.start_time_utc, Game.id) >= since)
+    return db.execute(q).all()
+
+
+def replay_elo(
+    games: Sequence[tuple[int, int, float, bool]],
+    n_teams: int,
+    params: EloParams = DEFAULT_PARAMS,
+    trace: list | None = None,
+) -> tuple[array, array]:
+    """
+    Pure core of a replay: (home_idx, away_idx, s_home, neutral) per game, teams numbered
+    0..n_teams-1. Returns (elo, games_played) arrays indexed the same way. With `trace`,
+    appends (home_pre, away_pre, home_post, away_post) per game.
+    """
+    elo = array("d", [params.initial]) * n_teams
+    gp = array("l", [0]) * n_teams
+    for h, a, s_home, neutral in games:
+        h_pre, a_pre = elo[h], elo[a]
+        elo[h], elo[a] = play_game(params, h_pre, gp[h], a_pre, gp[a], s_home, neutral)
+        gp[h] += 1
+        gp[a] += 1
+        if trace is not None:
+            trace.append((h_pre, a_pre, elo[h], elo[a]))
+    return elo, gp
+
+
+def replay_mov(
+    games: Sequence[tuple[int, int, int, int, bool]],
+    n_teams: int,
+    params: MovParams = DEFAULT_MOV_PARAMS,
+    trace: list | None = None,
+) -> array:
+    """
+    replay_elo for the margin-of-victory engine: (home_idx, away_idx, home_score,
+    away_score, neutral) per game. Returns the rating array; `trace` as in replay_elo.
+    """
+    elo = array("d", [params.initial]) * n_teams
+    for h, a, home_score, away_score, neutral in games:
+        h_pre, a_pre = elo[h], elo[a]
+        elo[h], elo[a] = play_game_mov(params, h_pre, a_pre, home_score, away_score, neutral)
+        if trace is not None:
+            trace.append((h_pre, a_pre, elo[h], elo[a]))
+    return elo
+
+
+def replay_season(
+    db: Session, season: str, params: EloParams = DEFAULT_PARAMS, mov_params: MovParams = DEFAULT_MOV_PARAMS
+) -> dict[str, float]:
+    """
+    Rebuilds a season's ratings (both engines) from scratch: every final in its date span,
+    oldest first (game id breaks ties), starting from params.initial. The same games always
+    give the same ratings, whatever order they were ingested or applied in before.
+    """
+    t0 = perf_counter()
+    rows = season_finals(db, season)
+
+    index: dict[int, int] = {}  # Team.id -> array slot
+    games = []
+    mov_games = []
+    for _, _, home_id, away_id, home_score, away_score, neutral_site in rows:
+        h = index.setdefault(home_id, len(index))
+        a = index.setdefault(away_id, len(index))
+        games.append((h, a, game_result(home_score, away_score), bool(neutral_site)))
+        mov_games.append((h, a, home_score, away_score, bool(neutral_site)))
+    trace: list[tuple[float, float, float, float]] = []
+    mov_trace: list[tuple[float, float, float, float]] = []
+    elo, gp = replay_elo(games, len(index), params, trace)
+    mov = replay_mov(mov_games, len(index), mov_params, mov_trace)
+
+    # Reset the season, then write the rebuilt state
+    db.execute(delete(TeamRating).where(TeamRating.season == season))
+    db.execute(delete(TeamMovRating).where(TeamMovRating.season == season))
+    db.execute(delete(RatingHistory).where(RatingHistory.season == season))
+    now = datetime.utcnow()
+    if index:
+        db.execute(insert(TeamRating), [
+            {"team_id": team_id, "season": season, "elo": elo[i], "games_played": gp[i], "last_updated_utc": now}
+            for team_id, i in index.items()
+        ])
+        db.execute(insert(TeamMovRating), [
+            {"team_id": team_id, "season": season, "elo": mov[i], "games_played": gp[i], "last_updated_utc": now}
+            for team_id, i in index.items()
+        ])
+    # Per-game history, rebuilt alongside (games_played counts up again game by game)
+    history = []
+    played = array("l", [0]) * len(index)
+    for (gid, start, home_id, away_id, hs, as_, _), (h, a, _, neutral), (h_pre, a_pre, h_post, a_post), m in zip(
+        rows, games, trace, mov_trace
+    ):
+        played[h] += 1
+        played[a] += 1
+        history.append(_history_row(
+            gid, home_id, season, start, h_pre, h_post, played[h], hs, as_, m[0], m[2], True, neutral
+        ))
+        history.append(_history_row(
+            gid, away_id, season, start, a_pre, a_post, played[a], as_, hs, m[1], m[3], False, neutral
+        ))
+    if history:
+        db.execute(insert(RatingHistory), history)
+    lo, hi = _season_bounds(season)
+    db.execute(
+        update(Game)
+        .where(Game.start_time_utc >= lo, Game.start_time_utc < hi)
+        .values(elo_applied=False)
+        .execution_options(synchronize_session=False)
+    )
+    _mark_applied(db, [r[0] for r in rows])
+    refresh_days(db)
+    db.commit()
+    return {"games_replayed": len(rows), "teams": len(index), "seconds": round(perf_counter() - t0, 3)}
+
+
+def seasons_missing_mov(db: Session) -> list[str]:
+    """
+    Seasons rated before the margin-of-victory engine existed: win/loss ratings but no MOV
+    ratings, or rating_history rows without MOV values.
+    """
+    rated = set(db.execute(select(TeamRating.season).distinct()).scalars())
+    seeded = set(db.execute(select(TeamMovRating.season).distinct()).scalars())
+    partial = set(db.execute(
+        select(RatingHistory.season).where(RatingHistory.mov_post.is_(None)).distinct()
+    ).scalars())
+    return sorted((rated - seeded) | partial)
+
+
+def seed_mov(db: Session, season: str, mov_params: MovParams = DEFAULT_MOV_PARAMS) -> dict[str, float]:
+    """
+    Builds the margin-of-victory ratings of a season that was rated before that engine
+    existed, leaving the win/loss ratings as they are: replays the MOV engine over the
+    finals already applied, in replay order, writes TeamMovRating and fills mov_pre/mov_post
+    (and the side/neutral site) into whichever of their rating_history rows exist. If history
+    doesn't cover every applied final, the whole season goes through replay_season instead.
+    Run by init_db for seasons_missing_mov.
+    """
+    if not _history_covers(db, season):
+        return {**replay_season(db, season), "full_replay": True}
+    t0 = perf_counter()
+    applied = set(db.execute(select(Game.id).where(Game.elo_applied.is_(True))).scalars())
+    rows = [r for r in season_finals(db, season) if r[0] in applied]
 
-        g.elo_applied = True
-        applied += 1
+    index: dict[int, int] = {}
+    mov_games = []
+    for _, _, home_id, away_id, home_score, away_score, neutral_site in rows:
+        h = index.setdefault(home_id, len(index))
+        a = index.setdefault(away_id, len(index))
+        mov_games.append((h, a, home_score, away_score, bool(neutral_site)))
+    trace: list[tuple[float, float, float, float]] = []
+    mov = replay_mov(mov_games, len(index), mov_params, trace)
+    played = array("l", [0]) * len(index)
+    for h, a, _, _, _ in mov_games:
+        played[h] += 1
+        played[a] += 1
 
+    db.execute(delete(TeamMovRating).where(TeamMovRating.season == season))
+    now = datetime.utcnow()
+    if index:
+        db.execute(insert(TeamMovRating), [
+            {"team_id": team_id, "season": season, "elo": mov[i], "games_played": played[i], "last_updated_utc": now}
+            for team_id, i in index.items()
+        ])
+    history = []
+    for (gid, _, home_id, away_id, _, _, neutral), (h_pre, a_pre, h_post, a_post) in zip(rows, trace):
+        history.append({"gid": gid, "tid": home_id, "mov_pre": h_pre, "mov_post": h_post, "home": True,
+                        "neutral_site": bool(neutral)})
+        history.append({"gid": gid, "tid": away_id, "mov_pre": a_pre, "mov_post": a_post, "home": False,
+                        "neutral_site": bool(neutral)})
+    if history:
+        # Core executemany: rows without a history row are simply not matched
+        t = RatingHistory.__table__
+        db.execute(
+            update(t)
+            .where(t.c.game_id == bindparam("gid"), t.c.team_id == bindparam("tid"))
+            .values(
+                mov_pre=bindparam("mov_pre"), mov_post=bindparam("mov_post"),
+                home=bindparam("home"), neutral_site=bindparam("neutral_site"),
+            ),
+            history,
+        )
     db.commit()
-    return {"final_games_found": len(games), "elo_games_applied": applied}
+    return {
+        "games_replayed": len(rows), "teams": len(index), "seconds": round(perf_counter() - t0, 3),
+        "full_replay": False,
+    }
@@ -1,9 +1,27 @@
 from __future__ import annotations
+import asyncio
+import codecs
+import hashlib
+import os
+import warnings
 import httpx
-from typing import Any
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterable
 
-ESPN_SCOREBOARD_URL = (
-    "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
+from . import archive
+from .jsonstream import EventStreamDecoder
+from .singleflight import SingleFlight
+from .throttle import CircuitBreaker, RetryPolicy, TokenBucket
+
+# Overridable so the app can be pointed at a local stand-in (see app/fake_espn.py)
+ESPN_SCOREBOARD_URL = os.environ.get(
+    "ESPN_SCOREBOARD_URL",
+    "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard",
+)
+ESPN_SUMMARY_URL = os.environ.get(
+    "ESPN_SUMMARY_URL",
+    "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary",
 )
 
 # Notes:
@@ -11,14 +29,381 @@ ESPN_SCOREBOARD_URL = (
 # - `limit=500` helps get all games for a day in one shot.
 # These patterns are widely used in community references. :contentReference[oaicite:2]{index=2}
 
-async def fetch_scoreboard(dates: str) -> dict[str, Any]:
-    params = {
+HEADERS = {"User-Agent": "cbb-tracker/1.0"}
+
+
+def _scoreboard_params(dates: str) -> dict[str, Any]:
+    return {
         "dates": dates,      # "YYYYMMDD" or "YYYYMMDD-YYYYMMDD"
         "groups": 50,
         "limit": 500,
     }
-    timeout = httpx.Timeout(20.0, connect=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        r = await client.get(ESPN_SCOREBOARD_URL, params=params, headers={"User-Agent": "cbb-tracker/1.0"})
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(20.0, connect=10.0)
+
+
+# Connection pool shared by every ESPN call in the process. HTTP/2 is used when asked for
+# and the optional `h2` package is installed (pip install "httpx[http2]").
+MAX_CONNECTIONS = int(os.environ.get("ESPN_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("ESPN_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP2 = os.environ.get("ESPN_HTTP2", "1") == "1"
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    The process-wide pooled client (keep-alive, optional HTTP/2), created on first use.
+    Opened and closed by the app lifespan; scripts get one lazily. A client is tied to
+    the event loop it was created on, so a new loop (e.g. another asyncio.run) gets a new one;
+    the old one is closed on its loop if that is still running, otherwise its connections
+    can't be released any more and a ResourceWarning says so (await close_client() before
+    the loop ends).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _release(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            timeout=_timeout(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            http2=HTTP2 and _http2_available(),
+            headers=HEADERS,
+        )
+        _client_loop = loop
+    return _client
+
+
+def _release(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Closes a client left behind by another event loop, on that loop when still possible."""
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    warnings.warn(
+        "ESPN client from a finished event loop was not closed; await close_client() before the loop ends",
+        ResourceWarning,
+        stacklevel=3,
+    )
+
+
+async def close_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        if _client_loop is asyncio.get_running_loop():
+            await _client.aclose()
+        elif not _client.is_closed:
+            _release(_client, _client_loop)
+    _client = None
+    _client_loop = None
+
+
+# Throughput controls shared by every ESPN request in the process
+RATE_LIMIT = float(os.environ.get("ESPN_RATE_LIMIT", "10"))  # requests/second, sustained
+RATE_BURST = float(os.environ.get("ESPN_RATE_BURST", "20"))
+limiter = TokenBucket(RATE_LIMIT, RATE_BURST)
+breaker = CircuitBreaker(
+    failure_threshold=int(os.environ.get("ESPN_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.environ.get("ESPN_BREAKER_RESET_SECONDS", "30")),
+)
+retry_policy = RetryPolicy()
+
+
+def _retry_after(r: httpx.Response) -> float | None:
+    try:
+        return float(r.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _send(
+    url: str, params: dict[str, Any], headers: dict[str, str] | None = None, stream: bool = False
+) -> httpx.Response:
+    """
+    Every ESPN request goes through here: the shared rate limit, the circuit breaker, and
+    retries with jittered exponential backoff on 429/5xx, timeouts and connection errors.
+    Raises CircuitOpenError without calling out while upstream is marked down. Any other
+    status is returned as-is; a streamed response must be closed by the caller.
+    """
+    client = get_client()
+    attempt = 0
+    while True:
+        trial = breaker.before_call()
+        try:
+            await limiter.acquire()
+            req = client.build_request("GET", url, params=params, headers=headers)
+            r = await client.send(req, stream=stream)
+        except httpx.TransportError:
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= retry_policy.attempts:
+                raise
+            await asyncio.sleep(retry_policy.delay(attempt - 1))
+            continue
+        except BaseException:
+            # Cancelled (sibling day failed, request timeout) or a local error: no verdict
+            # on upstream, but a half-open trial slot this call holds must not stay taken
+            if trial:
+                breaker.release()
+            raise
+        if r.status_code == 429 or r.status_code >= 500:
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= retry_policy.attempts:
+                return r
+            if stream:
+                await r.aclose()
+            await asyncio.sleep(retry_policy.delay(attempt - 1, _retry_after(r)))
+            continue
+        breaker.record_success()
+        return r
+
+
+# Per-day fan-out for date ranges
+DAY_CONCURRENCY = 6
+
+
+def split_dates(dates: str) -> list[str]:
+    """
+    "YYYYMMDD-YYYYMMDD" -> every YYYYMMDD in the span (inclusive); a single day -> [dates].
+    """
+    start, _, end = dates.partition("-")
+    if not end:
+        return [start]
+    d = datetime.strptime(start, "%Y%m%d").date()
+    last = datetime.strptime(end, "%Y%m%d").date()
+    out = []
+    while d <= last:
+        out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+
+class ValidatorCache:
+    """
+    Last-seen ETag / Last-Modified / body hash per dates key, for conditional requests.
+
+    Fetches stage new validators in a caller-owned dict; the caller commits them only once
+    the payload has been ingested, so a failed ingest never turns into "not modified" on
+    the next poll.
+    """
+
+    def __init__(self, max_keys: int = 1024) -> None:
+        self._entries: OrderedDict[str, dict[str, str | None]] = OrderedDict()
+        self._max_keys = max_keys
+
+    def get(self, dates: str) -> dict[str, str | None] | None:
+        return self._entries.get(dates)
+
+    def commit(self, staged: dict[str, dict[str, str | None]]) -> None:
+        for dates, v in staged.items():
+            self._entries[dates] = v
+            self._entries.move_to_end(dates)
+        while len(self._entries) > self._max_keys:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+validators = ValidatorCache()
+
+
+async def _fetch_one(dates: str, staged: dict[str, dict] | None = None) -> dict[str, Any] | None:
+    """
+    staged=None: plain GET. Otherwise a conditional GET that returns None when ESPN answers
+    304 or the body hashes the same as last time, and stages new validators into `staged`.
+    """
+    headers = {}
+    prev = validators.get(dates) if staged is not None else None
+    if prev:
+        if prev.get("etag"):
+            headers["If-None-Match"] = prev["etag"]
+        if prev.get("last_modified"):
+            headers["If-Modified-Since"] = prev["last_modified"]
+
+    r = await _send(ESPN_SCOREBOARD_URL, _scoreboard_params(dates), headers)
+    if staged is not None and r.status_code == 304:
+        return None
+    r.raise_for_status()
+
+    if staged is not None:
+        new = {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "body_hash": hashlib.sha256(r.content).hexdigest(),
+        }
+        if prev and prev.get("body_hash") == new["body_hash"]:
+            # Same bytes as what was last ingested; nothing to do, safe to remember now
+            validators.commit({dates: new})
+            return None
+        staged[dates] = new
+
+    if archive.enabled():
+        archive.store_payload(r.content, dates)
+    return r.json()
+
+
+async def _fetch_day(
+    day: str, sem: asyncio.Semaphore, staged: dict[str, dict] | None
+) -> tuple[str, dict[str, Any] | None]:
+    # Retries happen per request in _send, so one flaky day never refetches the others
+    async with sem:
+        return day, await _fetch_one(day, staged)
+
+
+async def iter_scoreboard_days(
+    dates: str, concurrency: int = DAY_CONCURRENCY, staged: dict[str, dict] | None = None
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Fetches each day of a range as its own request, `concurrency` at a time, retrying each
+    day on its own (see _send), and yields (YYYYMMDD, payload) in completion order so the
+    caller can start ingesting while slower days are still in flight. With `staged`,
+    requests are conditional and unchanged days are not yielded.
+    """
+    async for day, payload in iter_days(split_dates(dates), concurrency, staged):
+        yield day, payload
+
+
+async def iter_days(
+    days: list[str], concurrency: int = DAY_CONCURRENCY, staged: dict[str, dict] | None = None
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    iter_scoreboard_days over an explicit list of YYYYMMDD days (need not be contiguous).
+    """
+    sem = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(_fetch_day(d, sem, staged)) for d in days]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            day, payload = await fut
+            if payload is not None:
+                yield day, payload
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+_scoreboard_flights = SingleFlight()
+
+
+async def fetch_scoreboard(
+    dates: str,
+    split_days: bool = False,
+    concurrency: int = DAY_CONCURRENCY,
+    staged: dict[str, dict] | None = None,
+) -> dict[str, Any] | None:
+    """
+    split_days=True fetches a YYYYMMDD-YYYYMMDD range one day per request (concurrently)
+    and merges the events, instead of one request that can hit the limit=500 cap.
+
+    Passing `staged` (a dict) makes the requests conditional: returns None when nothing
+    changed since the validators last committed with `validators.commit(staged)`.
+
+    Concurrent calls for the same dates share one fetch and the same payload (treat it as
+    read-only); each conditional caller gets the staged validators in its own dict.
+    """
+    split_days = split_days and "-" in dates
+    key = (dates, split_days, staged is not None)
+    payload, fresh = await _scoreboard_flights.do(
+        key, lambda: _fetch_scoreboard(dates, split_days, concurrency, staged is not None)
+    )
+    if staged is not None:
+        staged.update(fresh)
+    return payload
+
+
+async def _fetch_scoreboard(
+    dates: str, split_days: bool, concurrency: int, conditional: bool
+) -> tuple[dict[str, Any] | None, dict[str, dict]]:
+    staged: dict[str, dict] | None = {} if conditional else None
+    if not split_days:
+        return await _fetch_one(dates, staged), staged or {}
+    events: dict[str, dict[str, Any]] = {}
+    async for _, payload in iter_scoreboard_days(dates, concurrency, staged):
+        for ev in payload.get("events") or []:
+            events[str(ev.get("id", ""))] = ev
+    if staged is not None and not events and not staged:
+        return None, {}
+    return {"events": list(events.values())}, staged or {}
+
+
+async def stream_day_events(
+    dates: str,
+    concurrency: int = DAY_CONCURRENCY,
+    staged: dict[str, dict] | None = None,
+    days_seen: list[str] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Events of a per-day fan-out, handed over as each day arrives (for ingest_event_stream).
+    Days that came back (i.e. weren't unchanged) are appended to `days_seen` if given.
+    """
+    async for day, payload in iter_scoreboard_days(dates, concurrency, staged):
+        if days_seen is not None:
+            days_seen.append(day)
+        for ev in payload.get("events") or []:
+            yield ev
+
+
+async def stream_scoreboard_events(dates: str) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yields scoreboard events one at a time as the response body arrives, without ever
+    holding the full payload (text or parsed) in memory. Meant for long date ranges.
+    """
+    decoder = EventStreamDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    r = await _send(ESPN_SCOREBOARD_URL, _scoreboard_params(dates), stream=True)
+    try:
         r.raise_for_status()
-        return r.json()
+        writer = archive.ArchiveWriter(dates) if archive.enabled() else None
+        try:
+            async for chunk in r.aiter_bytes():
+                if writer:
+                    writer.write(chunk)
+                for ev in decoder.feed(utf8.decode(chunk)):
+                    yield ev
+            for ev in decoder.feed(utf8.decode(b"", final=True)):
+                yield ev
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        if writer:
+            writer.commit()
+    finally:
+        await r.aclose()
+    decoder.close()
+
+
+async def fetch_game_summaries(
+    provider_game_ids: Iterable[str], concurrency: int = 8
+) -> dict[str, dict[str, Any] | Exception]:
+    """
+    Fetches ESPN's per-game summary (box score, plays, ...) for many events at once, at most
+    `concurrency` in flight. Failures are returned in place of the payload, not raised,
+    so one bad game doesn't sink the batch.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(gid: str) -> dict[str, Any]:
+        async with sem:
+            r = await _send(ESPN_SUMMARY_URL, {"event": gid})
+            r.raise_for_status()
+            return r.json()
+
+    ids = list(provider_game_ids)
+    results = await asyncio.gather(*(one(gid) for gid in ids), return_exceptions=True)
+    return dict(zip(ids, results))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+
+# Local stand-in for ESPN's scoreboard and summary endpoints, for load and latency testing:
+#
+#   FAKE_ESPN_LATENCY_MS=80 FAKE_ESPN_ERROR_RATE=0.02 uvicorn app.fake_espn:app --port 8001
+#   ESPN_SCOREBOARD_URL=http://127.0.0.1:8001/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard \
+#   ESPN_SUMMARY_URL=http://127.0.0.1:8001/apis/site/v2/sports/basketball/mens-college-basketball/summary \
+#   uvicorn app.main:app
+#
+# Days are generated deterministically from (seed, day), so runs are reproducible. Put
+# <YYYYMMDD>.json files (a real scoreboard body) in FAKE_ESPN_FIXTURES to serve those instead.
+
+BASE_PATH = "/apis/site/v2/sports/basketball/mens-college-basketball"
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0.0  # added to every response
+    jitter_ms: float = 0.0  # plus uniform 0..jitter_ms
+    error_rate: float = 0.0  # fraction of responses that are 503 (or 429, see below)
+    throttle_share: float = 0.25  # share of errors returned as 429 with Retry-After
+    games_per_day: int = 150
+    teams: int = 360
+    seed: int = 1
+    fixtures_dir: str | None = None
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    @classmethod
+    def from_env(cls) -> FakeConfig:
+        env = os.environ.get
+        return cls(
+            latency_ms=float(env("FAKE_ESPN_LATENCY_MS", "0")),
+            jitter_ms=float(env("FAKE_ESPN_JITTER_MS", "0")),
+            error_rate=float(env("FAKE_ESPN_ERROR_RATE", "0")),
+            throttle_share=float(env("FAKE_ESPN_THROTTLE_SHARE", "0.25")),
+            games_per_day=int(env("FAKE_ESPN_GAMES_PER_DAY", "150")),
+            teams=int(env("FAKE_ESPN_TEAMS", "360")),
+            seed=int(env("FAKE_ESPN_SEED", "1")),
+            fixtures_dir=env("FAKE_ESPN_FIXTURES") or None,
+        )
+
+
+def _days(dates: str) -> list[str]:
+    start, _, end = dates.partition("-")
+    d = datetime.strptime(start, "%Y%m%d").date()
+    last = datetime.strptime(end or start, "%Y%m%d").date()
+    out = []
+    while d <= last:
+        out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+
+def _status(start: datetime, now: datetime) -> str:
+    if start > now:
+        return "STATUS_SCHEDULED"
+    if now - start < timedelta(hours=2):
+        return "STATUS_IN_PROGRESS"
+    return "STATUS_FINAL"
+
+
+def generate_day(cfg: FakeConfig, day: str, now: datetime | None = None) -> list[dict[str, Any]]:
+    """
+    ESPN-shaped events for one YYYYMMDD. Games before `now` are final, games that tipped
+    within the last two hours are in progress, later ones are scheduled.
+    """
+    now = now or datetime.now(timezone.utc)
+    rnd = random.Random(f"{cfg.seed}:{day}")
+    base = datetime.strptime(day, "%Y%m%d").replace(hour=16, tzinfo=timezone.utc)
+    events = []
+    for i in range(cfg.games_per_day):
+        h, a = rnd.sample(range(1, cfg.teams + 1), 2)
+        start = base + timedelta(minutes=15 * rnd.randrange(0, 40))
+        status = _status(start, now)
+        hs, as_ = rnd.randint(50, 95), rnd.randint(50, 95)
+        if hs == as_:
+            hs += 1
+        if status == "STATUS_SCHEDULED":
+            hs = as_ = 0
+        elif status == "STATUS_IN_PROGRESS":
+            frac = (now - start) / timedelta(hours=2)
+            hs, as_ = int(hs * frac), int(as_ * frac)
+        events.append({
+            "id": f"{day}{i:04d}",
+            "date": start.strftime("%Y-%m-%dT%H:%MZ"),
+            "status": {"type": {"name": status}},
+            "competitions": [{
+                "neutralSite": rnd.random() < 0.1,
+                "competitors": [
+                    {"homeAway": "home", "team": {"id": str(h), "displayName": f"Team {h}"}, "score": str(hs)},
+                    {"homeAway": "away", "team": {"id": str(a), "displayName": f"Team {a}"}, "score": str(as_)},
+                ],
+            }],
+        })
+    return events
+
+
+def _day_events(cfg: FakeConfig, day: str) -> list[dict[str, Any]]:
+    if cfg.fixtures_dir:
+        path = Path(cfg.fixtures_dir) / f"{day}.json"
+        if path.exists():
+            return json.loads(path.read_text()).get("events") or []
+    return generate_day(cfg, day)
+
+
+def generate_summary(cfg: FakeConfig, event: dict[str, Any]) -> dict[str, Any]:
+    rnd = random.Random(f"{cfg.seed}:{event['id']}:box")
+    teams = []
+    for c in event["competitions"][0]["competitors"]:
+        fga, fg3a, fta = rnd.randint(50, 70), rnd.randint(15, 30), rnd.randint(10, 30)
+        oreb, dreb = rnd.randint(5, 15), rnd.randint(18, 30)
+        teams.append({
+            "team": {"id": c["team"]["id"]},
+            "statistics": [
+                {"name": "fieldGoalsMade-fieldGoalsAttempted", "displayValue": f"{int(fga * 0.44)}-{fga}"},
+                {"name": "threePointFieldGoalsMade-threePointFieldGoalsAttempted",
+                 "displayValue": f"{int(fg3a * 0.34)}-{fg3a}"},
+                {"name": "freeThrowsMade-freeThrowsAttempted", "displayValue": f"{int(fta * 0.7)}-{fta}"},
+                {"name": "offensiveRebounds", "displayValue": str(oreb)},
+                {"name": "defensiveRebounds", "displayValue": str(dreb)},
+                {"name": "totalRebounds", "displayValue": str(oreb + dreb)},
+                {"name": "turnovers", "displayValue": str(rnd.randint(6, 18))},
+            ],
+        })
+    return {"header": {"id": event["id"]}, "boxscore": {"teams": teams}}
+
+
+async def _delay(cfg: FakeConfig) -> None:
+    ms = cfg.latency_ms + (cfg.rng.uniform(0, cfg.jitter_ms) if cfg.jitter_ms else 0.0)
+    if ms > 0:
+        await asyncio.sleep(ms / 1000.0)
+
+
+def _injected_error(cfg: FakeConfig) -> Response | None:
+    if cfg.error_rate <= 0 or cfg.rng.random() >= cfg.error_rate:
+        return None
+    if cfg.rng.random() < cfg.throttle_share:
+        return Response(status_code=429, headers={"Retry-After": "1"})
+    return Response(status_code=503)
+
+
+def _json(request: Request, body: dict[str, Any]) -> Response:
+    raw = json.dumps(body, separators=(",", ":")).encode()
+    etag = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=raw, media_type="application/json", headers={"ETag": etag})
+
+
+def make_app(cfg: FakeConfig | None = None) -> FastAPI:
+    cfg = cfg or FakeConfig.from_env()
+    fake = FastAPI(title="Fake ESPN", version="0.1.0")
+    fake.state.config = cfg
+    fake.state.requests = 0
+
+    @fake.get(f"{BASE_PATH}/scoreboard")
+    async def scoreboard(request: Request, dates: str | None = None, limit: int = 500):
+        fake.state.requests += 1
+        await _delay(cfg)
+        err = _injected_error(cfg)
+        if err is not None:
+            return err
+        dates = dates or datetime.now(timezone.utc).strftime("%Y%m%d")
+        events = [ev for day in _days(dates) for ev in _day_events(cfg, day)]
+        # ESPN silently truncates at `limit`, which is why long ranges need split_days
+        return _json(request, {"events": events[:limit]})
+
+    @fake.get(f"{BASE_PATH}/summary")
+    async def summary(request: Request, event: str):
+        fake.state.requests += 1
+        await _delay(cfg)
+        err = _injected_error(cfg)
+        if err is not None:
+            return err
+        try:
+            events = _day_events(cfg, event[:8])  # generated ids start with their YYYYMMDD
+        except ValueError:
+            events = []
+        for ev in events:
+            if ev["id"] == event:
+                return _json(request, generate_summary(cfg, ev))
+        return Response(status_code=404)
+
+    return fake
+
+
+app = make_app()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .days import ESPN_DAY_OFFSET_HOURS
+from .models import Game, RatingHistory, Team
+
+
+def _end_of_day(d: date) -> datetime:
+    """End of ESPN scoreboard day `d` as naive UTC (late West Coast tips count as that day)."""
+    return datetime.combine(d + timedelta(days=1), time.min) + timedelta(hours=ESPN_DAY_OFFSET_HOURS)
+
+
+def ratings_as_of(
+    db: Session, season: str, as_of: date, limit: int = 50, engine: str = "elo"
+) -> list[dict[str, Any]]:
+    """
+    Every team's rating after its last game on or before `as_of`, best first. One indexed
+    pass over rating_history; teams that hadn't played yet are left out. engine="mov"
+    reads the margin-of-victory ratings instead; rows without one (written before that
+    engine and not yet seeded) are skipped rather than returned as None.
+    """
+    post = RatingHistory.mov_post if engine == "mov" else RatingHistory.elo_post
+    rn = func.row_number().over(
+        partition_by=RatingHistory.team_id,
+        order_by=(RatingHistory.played_at_utc.desc(), RatingHistory.game_id.desc()),
+    )
+    latest = (
+        select(RatingHistory.team_id, post.label("elo"), RatingHistory.games_played, rn.label("rn"))
+        .where(
+            RatingHistory.season == season,
+            RatingHistory.played_at_utc < _end_of_day(as_of),
+            post.is_not(None),
+        )
+        .subquery()
+    )
+    rows = db.execute(
+        select(latest.c.team_id, Team.name, latest.c.elo, latest.c.games_played)
+        .join(Team, Team.id == latest.c.team_id)
+        .where(latest.c.rn == 1)
+        .order_by(latest.c.elo.desc())
+        .limit(limit)
+    ).all()
+    return [
+        {"team_id": tid, "team_name": name, "season": season, "elo": elo, "games_played": gp}
+        for tid, name, elo, gp in rows
+    ]
+
+
+def team_history(db: Session, team_id: int, season: str) -> list[dict[str, Any]]:
+    """One team's rating game by game, oldest first."""
+    rows = db.execute(
+        select(RatingHistory, Game.home_team_id, Game.away_team_id)
+        .join(Game, Game.id == RatingHistory.game_id)
+        .where(RatingHistory.season == season, RatingHistory.team_id == team_id)
+        .order_by(RatingHistory.played_at_utc, RatingHistory.game_id)
+    ).all()
+    return [
+        {
+            "game_id": h.game_id,
+            "played_at_utc": h.played_at_utc.isoformat(),
+            "opponent_id": away_id if home_id == team_id else home_id,
+            "home": home_id == team_id,
+            "score_for": h.score_for,
+            "score_against": h.score_against,
+            "elo_pre": h.elo_pre,
+            "elo_post": h.elo_post,
+            "mov_pre": h.mov_pre,
+            "mov_post": h.mov_post,
+            "games_played": h.games_played,
+        }
+        for h, home_id, away_id in rows
+    ]
@@ -1,37 +1,19 @@
 from __future__ import annotations
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from .models import Team, Game
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .db import chunks
+from .models import Team, Game, GameChange
+from .days import thaw_days
+from .records import EventRecord, decode_events
+from .team_cache import team_index
 
+PROVIDER = "espn"
 
-def _to_utc_dt(iso_str: str | None) -> datetime | None:
-    if not iso_str:
-        return None
-    # ESPN often returns ISO timestamps like "2026-02-11T00:00Z" or with offset
-    dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
-    return dt.astimezone(timezone.utc)
-
-
-def _status_from_event(event: dict[str, Any]) -> str:
-    # Typical: event["status"]["type"]["name"] == "STATUS_SCHEDULED"/"STATUS_IN_PROGRESS"/"STATUS_FINAL"
-    try:
-        name = event["status"]["type"]["name"]
-    except Exception:
-        return "scheduled"
-    if "FINAL" in name:
-        return "final"
-    if "IN_PROGRESS" in name:
-        return "in_progress"
-    return "scheduled"
-
-
-def _safe_int(x) -> int | None:
-    try:
-        return int(x)
-    except Exception:
-        return None
+# Events normalized and written per round; bounds memory when events come from a stream.
+INGEST_CHUNK = 250
 
 
 def upsert_team(db: Session, provider: str, provider_team_id: str, name: str) -> Team:
@@ -47,18 +29,31 @@ def upsert_team(db: Session, provider: str, provider_team_id: str, name: str) ->
     return team
 
 
+def resolve_team_id(db: Session, provider: str, provider_team_id: str, name: str) -> int:
+    """
+    Team.id for a provider team, served from the process-wide index when the name is unchanged.
+    """
+    hit = team_index.get(db, provider, provider_team_id)
+    if hit and hit[1] == name:
+        return hit[0]
+    team = upsert_team(db, provider, provider_team_id, name)
+    team_index.stage(db, provider, provider_team_id, team.id, name)
+    return team.id
+
+
 def upsert_game(
     db: Session,
     provider: str,
     provider_game_id: str,
     start_time_utc: datetime | None,
     date_key: str,
-    home_team: Team,
-    away_team: Team,
+    home_team_id: int,
+    away_team_id: int,
     home_score: int | None,
     away_score: int | None,
     status: str,
     neutral_site: bool,
+    fingerprint: str | None = None,
 ) -> Game:
     q = select(Game).where(Game.provider == provider, Game.provider_game_id == provider_game_id)
     game = db.execute(q).scalar_one_or_none()
@@ -68,13 +63,14 @@ def upsert_game(
             provider_game_id=provider_game_id,
             start_time_utc=start_time_utc,
             date_key=date_key,
-            home_team_id=home_team.id,
-            away_team_id=away_team.id,
+            home_team_id=home_team_id,
+            away_team_id=away_team_id,
             home_score=home_score,
             away_score=away_score,
             status=status,
             neutral_site=neutral_site,
             elo_applied=False,
+            fingerprint=fingerprint,
         )
         db.add(game)
         return game
@@ -82,78 +78,312 @@ def upsert_game(
     # Update existing (DO NOT reset elo_applied)
     game.start_time_utc = start_time_utc
     game.date_key = date_key
-    game.home_team_id = home_team.id
-    game.away_team_id = away_team.id
+    game.home_team_id = home_team_id
+    game.away_team_id = away_team_id
     game.home_score = home_score
     game.away_score = away_score
     game.status = status
     game.neutral_site = neutral_site
+    game.fingerprint = fingerprint
     return game
 
 
+def _existing_games(db: Session, provider_game_ids: list[str]) -> dict[str, tuple]:
+    """
+    {provider_game_id: (Game.id, fingerprint, home_score, away_score, status)} for known games.
+    """
+    out: dict[str, tuple] = {}
+    for chunk in chunks(provider_game_ids):
+        q = select(
+            Game.provider_game_id, Game.id, Game.fingerprint, Game.home_score, Game.away_score, Game.status
+        ).where(Game.provider == PROVIDER, Game.provider_game_id.in_(chunk))
+        for gid, *rest in db.execute(q).tuples():
+            out[gid] = tuple(rest)
+    return out
+
 
-def ingest_scoreboard_json(db: Session, payload: dict[str, Any]) -> dict[str, int]:
-    provider = "espn"
-    events = payload.get("events") or []
+def _game_ids(db: Session, provider_game_ids: list[str]) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for chunk in chunks(provider_game_ids):
+        q = select(Game.provider_game_id, Game.id).where(
+            Game.provider == PROVIDER, Game.provider_game_id.in_(chunk)
+        )
+        out.update(db.execute(q).tuples().all())
+    return out
 
-    inserted_or_updated_games = 0
-    inserted_or_updated_teams = 0
 
-    for ev in events:
-        provider_game_id = str(ev.get("id", "")).strip()
-        if not provider_game_id:
-            continue
+def _change_kind(rec: EventRecord, prev: tuple | None) -> str | None:
+    # What downstream work (Elo, caches, live push) needs to hear about
+    if prev is None:
+        return "inserted"
+    _, _, home_score, away_score, status = prev
+    if status != rec.status:
+        return "status"
+    if home_score != rec.home_score or away_score != rec.away_score:
+        return "score"
+    return None
 
-        start_time_utc = _to_utc_dt(ev.get("date"))
-        date_key = (start_time_utc.date().isoformat() if start_time_utc else "unknown")
 
-        status = _status_from_event(ev)
+def _new_stats() -> dict[str, Any]:
+    return {
+        "events_seen": 0,
+        "teams_touched": 0,
+        "games_upserted": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "changed_game_ids": set(),
+        "commits": 0,
+    }
 
-        # ESPN structure: ev["competitions"][0]["competitors"] is usually [home, away]
-        competitions = ev.get("competitions") or []
-        if not competitions:
-            continue
-        comp = competitions[0]
-        neutral_site = bool(comp.get("neutralSite") or False)
 
-        competitors = comp.get("competitors") or []
-        home = next((c for c in competitors if c.get("homeAway") == "home"), None)
-        away = next((c for c in competitors if c.get("homeAway") == "away"), None)
-        if not home or not away:
-            continue
+class _IngestRun:
+    """
+    Accumulates events into INGEST_CHUNK-sized write rounds.
 
-        home_team_id = str(home.get("team", {}).get("id", "")).strip()
-        away_team_id = str(away.get("team", {}).get("id", "")).strip()
-        home_name = str(home.get("team", {}).get("displayName") or home.get("team", {}).get("name") or "").strip()
-        away_name = str(away.get("team", {}).get("displayName") or away.get("team", {}).get("name") or "").strip()
-        if not home_team_id or not away_team_id or not home_name or not away_name:
+    With batch_size set, commits and empties the session every batch_size events, so the
+    identity map stays small and the SQLite write lock is released regularly during long
+    backfills. Without it, everything is committed once in finish().
+    """
+
+    def __init__(self, db: Session, bulk: bool, batch_size: int | None) -> None:
+        self.db = db
+        self.bulk = bulk
+        self.batch_size = batch_size
+        self.stats = _new_stats()
+        self._events: list[dict[str, Any]] = []
+        self._since_commit = 0
+
+    def add_event(self, ev: dict[str, Any]) -> None:
+        self.stats["events_seen"] += 1
+        self._events.append(ev)
+        limit = INGEST_CHUNK
+        if self.batch_size:
+            limit = min(limit, self.batch_size - self._since_commit)
+        if len(self._events) >= limit:
+            self._flush_events()
+
+    def add_records(self, records: list[EventRecord]) -> None:
+        _write_records(self.db, records, self.bulk, self.stats)
+        self._wrote(len(records))
+
+    def _flush_events(self) -> None:
+        events, self._events = self._events, []
+        _write_records(self.db, decode_events(events), self.bulk, self.stats)
+        self._wrote(len(events))
+
+    def _wrote(self, n: int) -> None:
+        self._since_commit += n
+        if self.batch_size and self._since_commit >= self.batch_size:
+            self._commit()
+            self.db.expunge_all()
+
+    def _commit(self) -> None:
+        self.db.commit()
+        self.stats["commits"] += 1
+        self._since_commit = 0
+
+    def finish(self) -> dict[str, Any]:
+        if self._events:
+            self._flush_events()
+        self._commit()
+        self.stats["changed_game_ids"] = sorted(self.stats["changed_game_ids"])
+        return self.stats
+
+
+def _write_records(db: Session, records: list[EventRecord], bulk: bool, stats: dict[str, Any]) -> None:
+    # Last occurrence wins if a payload repeats an event (overlapping date ranges)
+    by_id = {r.provider_game_id: r for r in records}
+
+    known = _existing_games(db, list(by_id))
+    changed: list[tuple[EventRecord, str]] = []
+    feed: list[tuple[str, str]] = []
+    for gid, rec in by_id.items():
+        fp = rec.fingerprint()
+        prev = known.get(gid)
+        if prev is None:
+            stats["inserted"] += 1
+        elif prev[1] != fp:
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
             continue
+        changed.append((rec, fp))
+        kind = _change_kind(rec, prev)
+        if kind:
+            feed.append((gid, kind))
 
-        ht = upsert_team(db, provider, home_team_id, home_name)
-        at = upsert_team(db, provider, away_team_id, away_name)
-        inserted_or_updated_teams += 2
+    if bulk:
+        _bulk_write(db, changed)
+    else:
+        for rec, fp in changed:
+            ht = resolve_team_id(db, PROVIDER, rec.home_team_id, rec.home_name)
+            at = resolve_team_id(db, PROVIDER, rec.away_team_id, rec.away_name)
+            upsert_game(
+                db=db,
+                provider=PROVIDER,
+                provider_game_id=rec.provider_game_id,
+                start_time_utc=rec.start_time_utc,
+                date_key=rec.date_key,
+                home_team_id=ht,
+                away_team_id=at,
+                home_score=rec.home_score,
+                away_score=rec.away_score,
+                status=rec.status,
+                neutral_site=rec.neutral_site,
+                fingerprint=fp,
+            )
+        # Later batches look games up by query, so they must see this one's inserts
+        db.flush()
 
-        home_score = _safe_int(home.get("score"))
-        away_score = _safe_int(away.get("score"))
+    if changed:
+        # Every written game is reported, not just feed entries: a corrected start time or
+        # team also changes ratings and can move the game onto another (frozen) day
+        written = [rec.provider_game_id for rec, _ in changed]
+        ids = {gid: known[gid][0] for gid in written if gid in known}
+        ids.update(_game_ids(db, [gid for gid in written if gid not in ids]))
+        if feed:
+            db.execute(insert(GameChange), [{"game_id": ids[gid], "kind": kind} for gid, kind in feed])
+        thaw_days(db, ids.values())
+        stats["changed_game_ids"].update(ids.values())
 
-        upsert_game(
-            db=db,
-            provider=provider,
-            provider_game_id=provider_game_id,
-            start_time_utc=start_time_utc,
-            date_key=date_key,
-            home_team=ht,
-            away_team=at,
-            home_score=home_score,
-            away_score=away_score,
-            status=status,
-            neutral_site=neutral_site,
+    stats["teams_touched"] += 2 * len(changed)
+    stats["games_upserted"] += len(changed)
+
+
+def ingest_events(
+    db: Session, events: Iterable[dict[str, Any]], bulk: bool = False, batch_size: int | None = None
+) -> dict[str, Any]:
+    """
+    Upserts teams and games from an iterable of ESPN events, INGEST_CHUNK events at a time,
+    so a generator is never materialized in full.
+
+    Games whose normalized event hashes to the stored fingerprint are skipped entirely.
+    Games that were inserted or changed score or status are appended to the game_changes
+    feed. Every inserted or updated game is returned in changed_game_ids, so downstream
+    work can be limited to them.
+
+    bulk=True writes each chunk with a handful of set-based INSERT ... ON CONFLICT
+    statements instead of per-row SELECTs. batch_size commits (and clears the session)
+    every N events instead of once at the end.
+    """
+    run = _IngestRun(db, bulk, batch_size)
+    for ev in events:
+        run.add_event(ev)
+    return run.finish()
+
+
+async def ingest_event_stream(
+    db: Session, events: AsyncIterator[dict[str, Any]], bulk: bool = False, batch_size: int | None = None
+) -> dict[str, Any]:
+    """
+    Async twin of ingest_events for events decoded off the wire as they arrive
+    (see espn_client.stream_scoreboard_events).
+    """
+    run = _IngestRun(db, bulk, batch_size)
+    async for ev in events:
+        run.add_event(ev)
+    return run.finish()
+
+
+def ingest_records(
+    db: Session, batches: Iterable[list[EventRecord]], bulk: bool = False, batch_size: int | None = None
+) -> dict[str, Any]:
+    """
+    Writer half of ingest for EventRecords decoded elsewhere (replay, worker processes).
+    events_seen is left to the caller since raw events never reach this function.
+    """
+    run = _IngestRun(db, bulk, batch_size)
+    for records in batches:
+        run.add_records(records)
+    return run.finish()
+
+
+def ingest_scoreboard_json(
+    db: Session, payload: dict[str, Any], bulk: bool = False, batch_size: int | None = None
+) -> dict[str, Any]:
+    return ingest_events(db, payload.get("events") or [], bulk=bulk, batch_size=batch_size)
+
+
+def _bulk_upsert_teams(db: Session, names: dict[str, str]) -> dict[str, int]:
+    """
+    Upserts {provider_team_id: name} in one statement and returns {provider_team_id: Team.id}.
+    Teams already in the index under the same name are resolved without touching the database.
+    """
+    ids: dict[str, int] = {}
+    misses: dict[str, str] = {}
+    for k, v in names.items():
+        hit = team_index.get(db, PROVIDER, k)
+        if hit and hit[1] == v:
+            ids[k] = hit[0]
+        else:
+            misses[k] = v
+    if not misses:
+        return ids
+
+    stmt = sqlite_insert(Team)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Team.provider, Team.provider_team_id],
+        set_={"name": stmt.excluded.name},
+        where=Team.name != stmt.excluded.name,
+    )
+    db.execute(stmt, [{"provider": PROVIDER, "provider_team_id": k, "name": v} for k, v in misses.items()])
+
+    keys = list(misses)
+    for chunk in chunks(keys):
+        q = select(Team.provider_team_id, Team.id).where(
+            Team.provider == PROVIDER, Team.provider_team_id.in_(chunk)
         )
-        inserted_or_updated_games += 1
+        for k, tid in db.execute(q).tuples():
+            ids[k] = tid
+            team_index.stage(db, PROVIDER, k, tid, misses[k])
+    return ids
 
-    db.commit()
-    return {
-        "events_seen": len(events),
-        "teams_touched": inserted_or_updated_teams,
-        "games_upserted": inserted_or_updated_games,
-    }
+
+def _bulk_write(db: Session, changed: list[tuple[EventRecord, str]]) -> None:
+    if not changed:
+        return
+
+    names: dict[str, str] = {}
+    for rec, _ in changed:
+        names[rec.home_team_id] = rec.home_name
+        names[rec.away_team_id] = rec.away_name
+    team_ids = _bulk_upsert_teams(db, names)
+
+    games = [
+        {
+            "provider": PROVIDER,
+            "provider_game_id": rec.provider_game_id,
+            "start_time_utc": rec.start_time_utc,
+            "date_key": rec.date_key,
+            "home_team_id": team_ids[rec.home_team_id],
+            "away_team_id": team_ids[rec.away_team_id],
+            "home_score": rec.home_score,
+            "away_score": rec.away_score,
+            "status": rec.status,
+            "neutral_site": rec.neutral_site,
+            "elo_applied": False,
+            "fingerprint": fp,
+        }
+        for rec, fp in changed
+    ]
+
+    stmt = sqlite_insert(Game)
+    # Update existing (DO NOT reset elo_applied)
+    updatable = (
+        "start_time_utc", "date_key", "home_team_id", "away_team_id",
+        "home_score", "away_score", "status", "neutral_site", "fingerprint",
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Game.provider, Game.provider_game_id],
+        set_={c: stmt.excluded[c] for c in updatable},
+    )
+    db.execute(stmt, games)
+
+
+def changes_since(db: Session, after_seq: int = 0, limit: int = 1000) -> list[GameChange]:
+    """
+    Change-feed entries after a consumer's last seen seq, oldest first.
+    """
+    q = select(GameChange).where(GameChange.seq > after_seq).order_by(GameChange.seq.asc()).limit(limit)
+    return list(db.execute(q).scalars().all())
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import json
+import re
+from typing import Any
+
+# Characters that matter outside / inside a JSON string
+_STRUCT = re.compile(r'[\[\]{}",:]')
+_IN_STRING = re.compile(r'["\\]')
+_NON_WS = re.compile(r"\S")
+
+_decoder = json.JSONDecoder()
+
+
+class EventStreamDecoder:
+    """
+    Incrementally pulls the elements of one top-level array (ESPN's "events") out of a
+    JSON document that arrives in pieces.
+
+    feed() returns every element completed by the new text; only the unfinished element
+    is buffered, so memory is bounded by the largest single event, not the document.
+    Everything outside the array (leagues, season, day, ...) is skipped.
+    """
+
+    def __init__(self, key: str = "events") -> None:
+        self._key = json.dumps(key)
+        self._buf = ""
+        self._pos = 0
+        # Locating the array: a light scanner over the top-level object
+        self._depth = 0
+        self._in_str = False
+        self._str_start = 0
+        self._expect_key = False
+        self._last_key: str | None = None
+        self._want_array = False
+        self._in_array = False
+        self.done = False
+
+    def feed(self, text: str) -> list[Any]:
+        if self.done or not text:
+            return []
+        self._buf += text
+        out: list[Any] = []
+        if not self._in_array:
+            self._seek()
+        if self._in_array:
+            self._elements(out)
+        self._compact()
+        return out
+
+    def close(self) -> None:
+        """Raise if the stream ended inside the events array."""
+        if self._in_array and not self.done:
+            raise ValueError("scoreboard stream ended before the events array was closed")
+
+    def _elements(self, out: list[Any]) -> None:
+        buf = self._buf
+        n = len(buf)
+        pos = self._pos
+        while True:
+            m = _NON_WS.search(buf, pos)
+            if not m:
+                pos = n
+                break
+            j = m.start()
+            c = buf[j]
+            if c == "]":
+                self.done = True
+                pos = j + 1
+                break
+            if c == ",":
+                pos = j + 1
+                continue
+            try:
+                obj, end = _decoder.raw_decode(buf, j)
+            except json.JSONDecodeError:
+                # Element not complete yet; retry from its start on the next chunk
+                pos = j
+                break
+            # Only trust the element once its delimiter has arrived: a trailing
+            # scalar may still be growing ("3." of "3.5")
+            m = _NON_WS.search(buf, end)
+            if not m or buf[m.start()] not in ",]":
+                pos = j
+                break
+            out.append(obj)
+            pos = end
+        self._pos = pos
+
+    def _seek(self) -> None:
+        buf = self._buf
+        n = len(buf)
+        pos = self._pos
+        while pos < n:
+            if self._in_str:
+                m = _IN_STRING.search(buf, pos)
+                if not m:
+                    pos = n
+                    break
+                i = m.start()
+                if buf[i] == "\\":
+                    if i + 1 >= n:
+                        # escape split across chunks; resume at the backslash
+                        pos = i
+                        break
+                    pos = i + 2
+                    continue
+                self._in_str = False
+                pos = i + 1
+                if self._depth == 1 and self._expect_key:
+                    self._last_key = buf[self._str_start:pos]
+                continue
+
+            m = _STRUCT.search(buf, pos)
+            if not m:
+                pos = n
+                break
+            i = m.start()
+            c = buf[i]
+            pos = i + 1
+
+            if c == '"':
+                self._in_str = True
+                self._str_start = i
+                self._want_array = False
+            elif c == "{" or c == "[":
+                self._depth += 1
+                if self._want_array and c == "[" and self._depth == 2:
+                    self._in_array = True
+                    break
+                if self._depth == 1:
+                    self._expect_key = c == "{"
+                self._want_array = False
+            elif c == "}" or c == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Document closed without an events array
+                    self.done = True
+                    break
+            elif c == ":":
+                if self._depth == 1:
+                    self._expect_key = False
+                    self._want_array = self._last_key == self._key
+            elif c == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+                    self._want_array = False
+        self._pos = pos
+
+    def _compact(self) -> None:
+        cut = self._pos
+        if self._in_str:
+            cut = min(cut, self._str_start)
+        if cut:
+            self._buf = self._buf[cut:]
+            self._pos -= cut
+            self._str_start -= cut
@@ -1,24 +1,69 @@
 from __future__ import annotations
-from fastapi import FastAPI, Depends, BackgroundTasks, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, BackgroundTasks, HTTPException, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from datetime import date, datetime, timezone
 
-from .db import Base, engine, get_db
-from .models import Game, Team, TeamRating
-from .espn_client import fetch_scoreboard
-from .ingest import ingest_scoreboard_json
-from .elo import expected_score, get_or_create_rating, HOME_ADVANTAGE_ELO, apply_elo_to_final_games
-
-app = FastAPI(title="CBB Tracker", version="0.2.0")
-
-Base.metadata.create_all(bind=engine)
-
-
-def _default_dates_range() -> str:
+from .db import init_db, get_db
+from .models import Game, Team, TeamRating, TeamMovRating
+from .espn_client import (
+    fetch_scoreboard, stream_scoreboard_events, stream_day_events, get_client, close_client, validators,
+)
+from .ingest import ingest_scoreboard_json, ingest_event_stream, changes_since
+from .boxscores import fetch_box_scores
+from .throttle import CircuitOpenError
+from .singleflight import SingleFlight
+from .scheduler import Poller, POLLER_ENABLED
+from .backfill import backfill, progress as backfill_progress, BACKFILL_CONCURRENCY
+from .days import frozen_days
+from .history import ratings_as_of, team_history
+from .elo import (
+    expected_score,
+    get_or_create_rating,
+    HOME_ADVANTAGE_ELO,
+    DEFAULT_MOV_PARAMS,
+    ENGINES,
+    apply_elo_to_final_games,
+    replay_season,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled ESPN client for the app's lifetime; every fetch reuses its connections
+    get_client()
+    task = asyncio.create_task(poller.run()) if POLLER_ENABLED else None
+    yield
+    if task is not None:
+        poller.stop()
+        await task
+    await close_client()
+
+
+app = FastAPI(title="CBB Tracker", version="0.2.0", lifespan=lifespan)
+
+init_db()
+
+
+@app.exception_handler(CircuitOpenError)
+async def _upstream_down(request: Request, exc: CircuitOpenError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "30"})
+
+
+def _default_dates_range(db: Session | None = None) -> str | None:
     today_utc = datetime.now(timezone.utc).date()
     yday_utc = today_utc.fromordinal(today_utc.toordinal() - 1)
-    return f"{yday_utc.strftime('%Y%m%d')}-{today_utc.strftime('%Y%m%d')}"
+    days = [yday_utc.strftime('%Y%m%d'), today_utc.strftime('%Y%m%d')]
+    if db is not None:
+        # Frozen days (all final, Elo applied) are only refetched when asked for explicitly
+        frozen = frozen_days(db, days)
+        days = [d for d in days if d not in frozen]
+    if not days:
+        return None
+    return days[0] if len(days) == 1 else f"{days[0]}-{days[1]}"
 
 
 def _default_season() -> str:
@@ -26,14 +71,78 @@ def _default_season() -> str:
     return "2025-26"
 
 
-async def _run_ingest_and_recalc(dates: str, season: str) -> dict:
-    payload = await fetch_scoreboard(dates=dates)
+_update_flights = SingleFlight()
+
+
+async def _poll_update(dates: str) -> dict:
+    return await _run_ingest_and_recalc(dates, _default_season(), split_days="-" in dates)
+
+
+def _session() -> Session:
+    from .db import SessionLocal
+    return SessionLocal()
+
+
+# Live poller; started by the lifespan when CBB_POLLER=1
+poller = Poller(_poll_update, _session)
+
+
+async def _run_ingest_and_recalc(
+    dates: str,
+    season: str,
+    stream: bool = False,
+    batch_size: int | None = None,
+    split_days: bool = False,
+    force: bool = False,
+) -> dict:
+    # Identical updates that overlap (repeated /admin/update, a poller plus a manual sync)
+    # join the run already in flight instead of fetching and ingesting the same dates again
+    key = (dates, season, stream, split_days, force)
+    return await _update_flights.do(
+        key, lambda: _ingest_and_recalc(dates, season, stream, batch_size, split_days, force)
+    )
+
+
+async def _ingest_and_recalc(
+    dates: str,
+    season: str,
+    stream: bool,
+    batch_size: int | None,
+    split_days: bool,
+    force: bool,
+) -> dict:
+    # Conditional requests (unless forced or streaming): validators are staged here and
+    # only committed once ingest and Elo have succeeded
+    staged = None if (force or stream) else {}
+    payload = None
+    if not (stream or split_days):
+        payload = await fetch_scoreboard(dates=dates, staged=staged)
+        if payload is None:
+            return {"not_modified": True}
     from .db import SessionLocal
     db = SessionLocal()
     try:
-        ingest_stats = ingest_scoreboard_json(db, payload)
-        elo_stats = apply_elo_to_final_games(db, season=season)
-        return {"ingest": ingest_stats, "elo": elo_stats}
+        if split_days:
+            # One request per day, concurrently; each day is ingested as soon as it lands
+            days_seen: list[str] = []
+            ingest_stats = await ingest_event_stream(
+                db, stream_day_events(dates, staged=staged, days_seen=days_seen), bulk=True, batch_size=batch_size
+            )
+            if staged is not None and not days_seen:
+                # Every day was unchanged: nothing was ingested, skip Elo and box scores
+                return {"not_modified": True}
+        elif stream:
+            # Decode events as they arrive; memory stays bounded by one ingest chunk
+            ingest_stats = await ingest_event_stream(
+                db, stream_scoreboard_events(dates), bulk=True, batch_size=batch_size
+            )
+        else:
+            ingest_stats = ingest_scoreboard_json(db, payload, bulk=True, batch_size=batch_size)
+        elo_stats = apply_elo_to_final_games(db, season=season, game_ids=ingest_stats["changed_game_ids"])
+        if staged:
+            validators.commit(staged)
+        box_stats = await fetch_box_scores(db, ingest_stats["changed_game_ids"])
+        return {"ingest": ingest_stats, "elo": elo_stats, "box_scores": box_stats}
     finally:
         db.close()
 
@@ -47,43 +156,109 @@ def root():
             "POST update (bg)": "/admin/update?dates=YYYYMMDD-YYYYMMDD",
             "POST update_sync": "/admin/update_sync?dates=YYYYMMDD-YYYYMMDD",
             "POST recalc_elo": "/admin/recalc_elo",
+            "POST box_scores": "/admin/box_scores",
+            "GET poller": "/admin/poller",
+            "POST backfill (bg)": "/admin/backfill?season=2025-26",
             "GET teams": "/teams",
             "GET games": "/games?game_date=YYYY-MM-DD",
+            "GET game changes": "/games/changes?since=0",
+            "GET ratings as of": "/ratings?as_of=YYYY-MM-DD",
+            "GET margin-of-victory ratings": "/ratings?engine=mov",
+            "GET team rating history": "/teams/1/ratings",
             "GET predict": "/predict?home_team_id=1&away_team_id=2&neutral=0",
         },
     }
 
 
 @app.post("/admin/update")
-async def admin_update(background_tasks: BackgroundTasks, dates: str | None = None, season: str | None = None):
-    dates = dates or _default_dates_range()
+async def admin_update(
+    background_tasks: BackgroundTasks,
+    dates: str | None = None,
+    season: str | None = None,
+    stream: bool = False,
+    batch_size: int | None = None,
+    split_days: bool = False,
+    force: bool = False,
+    db: Session = Depends(get_db),
+):
+    dates = dates or _default_dates_range(db)
     season = season or _default_season()
-    background_tasks.add_task(_run_ingest_and_recalc, dates, season)
-    return {"queued": True, "dates": dates, "season": season}
+    if dates is None:
+        return {"queued": False, "frozen": True, "season": season}
+    background_tasks.add_task(_run_ingest_and_recalc, dates, season, stream, batch_size, split_days, force)
+    return {"queued": True, "dates": dates, "season": season, "stream": stream, "split_days": split_days}
 
 
 @app.post("/admin/update_sync")
-async def admin_update_sync(dates: str | None = None, season: str | None = None):
-    dates = dates or _default_dates_range()
+async def admin_update_sync(
+    dates: str | None = None,
+    season: str | None = None,
+    stream: bool = False,
+    batch_size: int | None = None,
+    split_days: bool = False,
+    force: bool = False,
+    db: Session = Depends(get_db),
+):
+    dates = dates or _default_dates_range(db)
+    season = season or _default_season()
+    if dates is None:
+        return {"dates": None, "season": season, "stats": {"frozen": True}}
+    stats = await _run_ingest_and_recalc(dates, season, stream, batch_size, split_days, force)
+    return {"dates": dates, "season": season, "stats": stats}
+
+
+@app.post("/admin/recalc_elo")
+def admin_recalc_elo(season: str | None = None, replay: bool = False, db: Session = Depends(get_db)):
     season = season or _default_season()
-    payload = await fetch_scoreboard(dates=dates)
+    # replay=1 resets the season and rebuilds it from every final in start-time order
+    stats = replay_season(db, season) if replay else apply_elo_to_final_games(db, season=season)
+    return {"season": season, "stats": stats}
+
 
+@app.post("/admin/box_scores")
+async def admin_box_scores(concurrency: int = 8):
     from .db import SessionLocal
     db = SessionLocal()
     try:
-        ingest_stats = ingest_scoreboard_json(db, payload)
-        elo_stats = apply_elo_to_final_games(db, season=season)
+        stats = await fetch_box_scores(db, concurrency=concurrency)
     finally:
         db.close()
+    return {"stats": stats}
 
-    return {"dates": dates, "season": season, "stats": {"ingest": ingest_stats, "elo": elo_stats}}
 
+async def _run_backfill(season: str, dates: str | None, concurrency: int, restart: bool) -> dict:
+    async def run() -> dict:
+        db = _session()
+        try:
+            return await backfill(db, season, dates, concurrency, restart)
+        finally:
+            db.close()
+    # One backfill per span at a time; a second request joins the one running
+    return await _update_flights.do(("backfill", season, dates), run)
 
-@app.post("/admin/recalc_elo")
-def admin_recalc_elo(season: str | None = None, db: Session = Depends(get_db)):
+
+@app.post("/admin/backfill")
+async def admin_backfill(
+    background_tasks: BackgroundTasks,
+    season: str | None = None,
+    dates: str | None = None,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    restart: bool = False,
+):
     season = season or _default_season()
-    stats = apply_elo_to_final_games(db, season=season)
-    return {"season": season, "stats": stats}
+    background_tasks.add_task(_run_backfill, season, dates, concurrency, restart)
+    return {"queued": True, "season": season, "dates": dates}
+
+
+@app.get("/admin/backfill")
+def admin_backfill_progress(season: str | None = None, dates: str | None = None, db: Session = Depends(get_db)):
+    season = season or _default_season()
+    return {"season": season, "dates": dates, "progress": backfill_progress(db, season, dates)}
+
+
+@app.get("/admin/poller")
+def admin_poller():
+    return {"enabled": POLLER_ENABLED, **poller.status}
 
 
 @app.get("/stats")
@@ -127,14 +302,47 @@ def list_games(game_date: date | None = None, db: Session = Depends(get_db)):
     return out
 
 
+@app.get("/games/changes")
+def list_game_changes(since: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
+    changes = changes_since(db, after_seq=since, limit=limit)
+    return {
+        "next": changes[-1].seq if changes else since,
+        "changes": [
+            {
+                "seq": c.seq,
+                "game_id": c.game_id,
+                "kind": c.kind,
+                "changed_at_utc": c.changed_at_utc.isoformat(),
+            }
+            for c in changes
+        ],
+    }
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise HTTPException(status_code=400, detail=f"engine must be one of {', '.join(ENGINES)}")
+
+
 @app.get("/ratings")
-def list_ratings(limit: int = 50, season: str | None = None, db: Session = Depends(get_db)):
+def list_ratings(
+    limit: int = 50,
+    season: str | None = None,
+    as_of: date | None = None,
+    engine: str = "elo",
+    db: Session = Depends(get_db),
+):
+    _check_engine(engine)
     season = season or _default_season()
+    if as_of:
+        # From rating_history: each team's rating after its last game on or before as_of
+        return ratings_as_of(db, season, as_of, limit, engine)
+    model = TeamMovRating if engine == "mov" else TeamRating
     rs = db.execute(
-        select(TeamRating, Team)
-        .join(Team, Team.id == TeamRating.team_id)
-        .where(TeamRating.season == season)
-        .order_by(TeamRating.elo.desc())
+        select(model, Team)
+        .join(Team, Team.id == model.team_id)
+        .where(model.season == season)
+        .order_by(model.elo.desc())
         .limit(limit)
     ).all()
 
@@ -144,23 +352,43 @@ def list_ratings(limit: int = 50, season: str | None = None, db: Session = Depen
     ]
 
 
+@app.get("/teams/{team_id}/ratings")
+def list_team_ratings(team_id: int, season: str | None = None, db: Session = Depends(get_db)):
+    season = season or _default_season()
+    return {"team_id": team_id, "season": season, "history": team_history(db, team_id, season)}
+
+
 @app.get("/predict")
 def predict(
     home_team_id: int,
     away_team_id: int,
     neutral: int = 0,
     season: str | None = None,
+    engine: str = "elo",
     db: Session = Depends(get_db),
 ):
+    _check_engine(engine)
     season = season or _default_season()
-    home = get_or_create_rating(db, home_team_id, season)
-    away = get_or_create_rating(db, away_team_id, season)
+    if engine == "mov":
+        # Teams without a MOV row yet sit at the starting rating
+        home = db.get(TeamMovRating, (home_team_id, season)) or TeamMovRating(
+            team_id=home_team_id, season=season, elo=DEFAULT_MOV_PARAMS.initial, games_played=0
+        )
+        away = db.get(TeamMovRating, (away_team_id, season)) or TeamMovRating(
+            team_id=away_team_id, season=season, elo=DEFAULT_MOV_PARAMS.initial, games_played=0
+        )
+        home_advantage = DEFAULT_MOV_PARAMS.home_advantage
+    else:
+        home = get_or_create_rating(db, home_team_id, season)
+        away = get_or_create_rating(db, away_team_id, season)
+        home_advantage = HOME_ADVANTAGE_ELO
 
-    home_adj = 0.0 if neutral else HOME_ADVANTAGE_ELO
+    home_adj = 0.0 if neutral else home_advantage
     p_home = expected_score(home.elo + home_adj, away.elo)
 
     return {
         "season": season,
+        "engine": engine,
         "home_team_id": home_team_id,
         "away_team_id": away_team_id,
         "neutral": bool(neutral),
@@ -170,6 +398,6 @@ def predict(
         "away_win_prob": 1.0 - p_home,
         "explain": {
             "elo_gap": (home.elo + home_adj) - away.elo,
-            "home_advantage_elo": 0.0 if neutral else HOME_ADVANTAGE_ELO,
+            "home_advantage_elo": home_adj,
         },
     }
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, UniqueConstraint, Float
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, UniqueConstraint, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from .db import Base
@@ -35,6 +35,22 @@ class TeamRating(Base):
     team: Mapped["Team"] = relationship()
 
 
+class TeamMovRating(Base):
+    """
+    Margin-of-victory Elo (see elo.MovParams), kept next to TeamRating and updated in the
+    same pass over finals. One row per team per season.
+    """
+    __tablename__ = "team_mov_ratings"
+
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    season: Mapped[str] = mapped_column(String, primary_key=True)
+
+    elo: Mapped[float] = mapped_column(Float, default=1500.0)
+    games_played: Mapped[int] = mapped_column(Integer, default=0)
+
+    last_updated_utc: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class Game(Base):
     __tablename__ = "games"
 
@@ -58,6 +74,12 @@ class Game(Base):
     # Elo bookkeeping (so we don't double-apply updates)
     elo_applied: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
 
+    # Hash of the normalized ESPN event; re-ingest skips the write when it matches
+    fingerprint: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # Failed box-score (game summary) fetches; retried by later updates up to a limit
+    box_score_failures: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     home_team: Mapped["Team"] = relationship(foreign_keys=[home_team_id])
     away_team: Mapped["Team"] = relationship(foreign_keys=[away_team_id])
 
@@ -66,3 +88,100 @@ class Game(Base):
     __table_args__ = (
         UniqueConstraint("provider", "provider_game_id", name="uq_game_provider_id"),
     )
+
+
+class GameChange(Base):
+    """
+    Append-only change feed written by ingest: one row each time a game is inserted or its
+    score or status changes. Consumers remember the last seq they processed.
+    """
+    __tablename__ = "game_changes"
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), index=True)
+    kind: Mapped[str] = mapped_column(String)  # inserted/status/score
+    changed_at_utc: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class TeamBoxScore(Base):
+    """
+    One team's box-score totals for a final game (from ESPN's game summary).
+    Inputs for possession-based efficiency ratings.
+    """
+    __tablename__ = "team_box_scores"
+
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True, index=True)
+
+    fgm: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fga: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fg3m: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fg3a: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ftm: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fta: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    oreb: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    dreb: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reb: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tov: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    fetched_at_utc: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class BackfillCheckpoint(Base):
+    """
+    One row per ESPN scoreboard day a backfill has fetched and ingested; a restarted
+    backfill skips these.
+    """
+    __tablename__ = "backfill_checkpoints"
+
+    day: Mapped[str] = mapped_column(String, primary_key=True)  # YYYYMMDD
+    season: Mapped[str] = mapped_column(String, index=True)
+    events: Mapped[int] = mapped_column(Integer, default=0)
+    completed_at_utc: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class FrozenDay(Base):
+    """
+    An ESPN scoreboard day whose games are all final with Elo applied. Nothing left to
+    fetch: pollers, default update ranges and backfills skip it. Ingest removes the marker
+    when one of its games changes; the Elo pass sets it again.
+    """
+    __tablename__ = "frozen_days"
+
+    day: Mapped[str] = mapped_column(String, primary_key=True)  # YYYYMMDD, as in scoreboard `dates`
+    games: Mapped[int] = mapped_column(Integer, default=0)
+    frozen_at_utc: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class RatingHistory(Base):
+    """
+    One team's rating before and after one final, appended by the Elo pass. Answers
+    "rating as of a date" and rating curves without replaying games.
+    """
+    __tablename__ = "rating_history"
+
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    season: Mapped[str] = mapped_column(String)
+    played_at_utc: Mapped[datetime] = mapped_column(DateTime)  # the game's start time
+
+    elo_pre: Mapped[float] = mapped_column(Float)
+    elo_post: Mapped[float] = mapped_column(Float)
+    games_played: Mapped[int] = mapped_column(Integer)  # including this game
+
+    # The result that was applied, as this team saw it
+    score_for: Mapped[int] = mapped_column(Integer)
+    score_against: Mapped[int] = mapped_column(Integer)
+
+    # Margin-of-victory engine (TeamMovRating), updated in the same pass
+    mov_pre: Mapped[float | None] = mapped_column(Float, nullable=True)
+    mov_post: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Where the game was played, as applied (home side / neutral court change the result)
+    home: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    neutral_site: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
+    __table_args__ = (
+        Index("ix_rating_history_team", "season", "team_id", "played_at_utc"),
+        Index("ix_rating_history_time", "season", "played_at_utc"),
+    )
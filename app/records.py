@@ -0,0 +1,120 @@
+from __future__ import annotations
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Iterable, NamedTuple
+
+
+def _to_utc_dt(iso_str: str | None) -> datetime | None:
+    if not iso_str:
+        return None
+    # ESPN often returns ISO timestamps like "2026-02-11T00:00Z" or with offset
+    dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+    return dt.astimezone(timezone.utc)
+
+
+def _status_from_event(event: dict[str, Any]) -> str:
+    # Typical: event["status"]["type"]["name"] == "STATUS_SCHEDULED"/"STATUS_IN_PROGRESS"/"STATUS_FINAL"
+    try:
+        name = event["status"]["type"]["name"]
+    except Exception:
+        return "scheduled"
+    if "FINAL" in name:
+        return "final"
+    if "IN_PROGRESS" in name:
+        return "in_progress"
+    return "scheduled"
+
+
+def safe_int(x) -> int | None:
+    try:
+        return int(x)
+    except Exception:
+        return None
+
+
+class EventRecord(NamedTuple):
+    """
+    One ESPN event reduced to what we persist. Tuple-backed: small, immutable, picklable
+    (crosses process boundaries in parallel replay) and cheap to build in bulk.
+    Team ids here are ESPN's provider ids, not Team.id.
+    """
+
+    provider_game_id: str
+    start_time_utc: datetime | None
+    date_key: str  # YYYY-MM-DD (UTC date of start)
+    status: str  # scheduled/in_progress/final
+    neutral_site: bool
+    home_team_id: str
+    home_name: str
+    away_team_id: str
+    away_name: str
+    home_score: int | None
+    away_score: int | None
+
+    def fingerprint(self) -> str:
+        """Compact hash of every persisted field; equal hashes mean nothing to write."""
+        st = self.start_time_utc
+        parts = (
+            st.isoformat() if st else "",
+            self.status,
+            "1" if self.neutral_site else "0",
+            self.home_team_id, self.home_name,
+            self.away_team_id, self.away_name,
+            "" if self.home_score is None else str(self.home_score),
+            "" if self.away_score is None else str(self.away_score),
+        )
+        return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def decode_event(ev: dict[str, Any]) -> EventRecord | None:
+    """
+    Flatten one ESPN event into an EventRecord, or None if it is unusable.
+    """
+    provider_game_id = str(ev.get("id", "")).strip()
+    if not provider_game_id:
+        return None
+
+    start_time_utc = _to_utc_dt(ev.get("date"))
+    date_key = (start_time_utc.date().isoformat() if start_time_utc else "unknown")
+
+    # ESPN structure: ev["competitions"][0]["competitors"] is usually [home, away]
+    competitions = ev.get("competitions") or []
+    if not competitions:
+        return None
+    comp = competitions[0]
+
+    competitors = comp.get("competitors") or []
+    home = next((c for c in competitors if c.get("homeAway") == "home"), None)
+    away = next((c for c in competitors if c.get("homeAway") == "away"), None)
+    if not home or not away:
+        return None
+
+    home_team = home.get("team", {})
+    away_team = away.get("team", {})
+    home_team_id = str(home_team.get("id", "")).strip()
+    away_team_id = str(away_team.get("id", "")).strip()
+    home_name = str(home_team.get("displayName") or home_team.get("name") or "").strip()
+    away_name = str(away_team.get("displayName") or away_team.get("name") or "").strip()
+    if not home_team_id or not away_team_id or not home_name or not away_name:
+        return None
+
+    return EventRecord(
+        provider_game_id,
+        start_time_utc,
+        date_key,
+        _status_from_event(ev),
+        bool(comp.get("neutralSite") or False),
+        home_team_id,
+        home_name,
+        away_team_id,
+        away_name,
+        safe_int(home.get("score")),
+        safe_int(away.get("score")),
+    )
+
+
+def decode_events(events: Iterable[dict[str, Any]]) -> list[EventRecord]:
+    """
+    Pure-CPU half of ingest: ESPN events -> EventRecords (no DB access).
+    """
+    return [r for r in map(decode_event, events) if r is not None]
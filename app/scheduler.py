@@ -0,0 +1,158 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .days import as_utc, espn_day, frozen_days
+from .models import Game
+
+log = logging.getLogger(__name__)
+
+# Built-in live poller (opt-in: CBB_POLLER=1). Cadence follows the games table:
+#   FAST  while anything is in progress (or tipped within the last LIVE_GRACE_HOURS)
+#   SLOW  when only scheduled (or stale, never-started) games remain, waking early for
+#         the next tip-off
+#   IDLE  when every tracked day is final (just watches for the next slate)
+POLLER_ENABLED = os.environ.get("CBB_POLLER", "0") == "1"
+FAST_SECONDS = float(os.environ.get("CBB_POLL_FAST_SECONDS", "30"))
+SLOW_SECONDS = float(os.environ.get("CBB_POLL_SLOW_SECONDS", "600"))
+IDLE_SECONDS = float(os.environ.get("CBB_POLL_IDLE_SECONDS", "3600"))
+LOOKBACK_DAYS = int(os.environ.get("CBB_POLL_LOOKBACK_DAYS", "2"))
+# A game still "scheduled" this long after tip-off (postponed, canceled, suspended) no
+# longer counts as live; its day is polled at the slow cadence
+LIVE_GRACE_HOURS = float(os.environ.get("CBB_POLL_LIVE_GRACE_HOURS", "4"))
+
+
+def plan_poll(db: Session, now: datetime | None = None) -> tuple[list[str], float]:
+    """
+    (YYYYMMDD days to fetch, seconds until the next poll) from what is in `games`.
+
+    Only days that still have non-final games within the lookback window are fetched,
+    plus today while its slate is unknown or unfinished; all-final and frozen days are
+    left alone.
+    """
+    now = as_utc(now or datetime.now(timezone.utc))
+    today = espn_day(now)
+    since = (now - timedelta(days=LOOKBACK_DAYS + 1)).replace(tzinfo=None)
+
+    rows = db.execute(
+        select(Game.start_time_utc, Game.status).where(
+            Game.start_time_utc.is_not(None), Game.start_time_utc >= since
+        )
+    ).all()
+
+    pending: set[date] = set()
+    seen: set[date] = set()
+    live = stale = False
+    next_tip: datetime | None = None
+    grace = timedelta(hours=LIVE_GRACE_HOURS)
+    for start, status in rows:
+        start = as_utc(start)
+        day = espn_day(start)
+        if day < today - timedelta(days=LOOKBACK_DAYS):
+            continue
+        seen.add(day)
+        if status == "final":
+            continue
+        pending.add(day)
+        if status == "in_progress" or start <= now < start + grace:
+            live = True
+        elif start <= now:
+            stale = True
+        elif next_tip is None or start < next_tip:
+            next_tip = start
+
+    if today not in seen:
+        pending.add(today)  # nothing known about today yet: fetch to discover the slate
+    pending -= {
+        datetime.strptime(d, "%Y%m%d").date()
+        for d in frozen_days(db, [d.strftime("%Y%m%d") for d in pending])
+    }
+
+    if live:
+        delay = FAST_SECONDS
+    elif next_tip is not None:
+        delay = max(FAST_SECONDS, min(SLOW_SECONDS, (next_tip - now).total_seconds()))
+    elif stale:
+        delay = SLOW_SECONDS
+    else:
+        delay = IDLE_SECONDS
+    return [d.strftime("%Y%m%d") for d in sorted(pending)], delay
+
+
+def date_spans(days: list[str]) -> list[str]:
+    """Sorted YYYYMMDD days -> scoreboard `dates` values, contiguous runs as ranges."""
+    spans: list[list[date]] = []
+    for d in (datetime.strptime(x, "%Y%m%d").date() for x in days):
+        if spans and d - spans[-1][1] == timedelta(days=1):
+            spans[-1][1] = d
+        else:
+            spans.append([d, d])
+    return [
+        a.strftime("%Y%m%d") if a == b else f"{a:%Y%m%d}-{b:%Y%m%d}"
+        for a, b in spans
+    ]
+
+
+class Poller:
+    """
+    Runs `run_update(dates)` for the days plan_poll picks, then sleeps for the delay it
+    chose. Updates are conditional and coalesced upstream, so overlapping with a manual
+    /admin/update is cheap.
+    """
+
+    def __init__(
+        self,
+        run_update: Callable[[str], Awaitable[Any]],
+        session_factory: Callable[[], Session],
+    ) -> None:
+        self._run_update = run_update
+        self._session_factory = session_factory
+        self._stop = asyncio.Event()
+        self.status: dict[str, Any] = {"running": False, "polls": 0, "errors": 0}
+
+    def _plan(self) -> tuple[list[str], float]:
+        db = self._session_factory()
+        try:
+            return plan_poll(db)
+        finally:
+            db.close()
+
+    async def tick(self) -> float:
+        days, _ = self._plan()
+        for dates in date_spans(days):
+            await self._run_update(dates)
+        # The cadence comes from the state the fetch just produced
+        _, delay = self._plan()
+        self.status.update(
+            polls=self.status["polls"] + 1,
+            last_poll_utc=datetime.now(timezone.utc).isoformat(),
+            last_days=days,
+            next_delay_s=delay,
+        )
+        return delay
+
+    async def run(self) -> None:
+        self.status["running"] = True
+        try:
+            while not self._stop.is_set():
+                try:
+                    delay = await self.tick()
+                except Exception:
+                    log.exception("poll failed")
+                    self.status["errors"] += 1
+                    delay = SLOW_SECONDS
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.status["running"] = False
+
+    def stop(self) -> None:
+        self._stop.set()
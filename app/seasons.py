@@ -0,0 +1,34 @@
+from __future__ import annotations
+from datetime import date
+
+# A season "2025-26" runs from early November through the title game in early April.
+SEASON_START = (11, 1)  # (month, day) in the first year
+SEASON_END = (4, 15)  # (month, day) in the second year
+
+
+def season_span(season: str) -> tuple[date, date]:
+    """
+    "2025-26" -> (2025-11-01, 2026-04-15), inclusive.
+    """
+    first, _, _ = season.partition("-")
+    try:
+        y = int(first)
+    except ValueError:
+        raise ValueError(f"bad season {season!r}, expected e.g. '2025-26'") from None
+    return date(y, *SEASON_START), date(y + 1, *SEASON_END)
+
+
+def season_dates(season: str) -> str:
+    """
+    The season as a scoreboard `dates` range, YYYYMMDD-YYYYMMDD.
+    """
+    start, end = season_span(season)
+    return f"{start:%Y%m%d}-{end:%Y%m%d}"
+
+
+def season_for(d: date) -> str:
+    """
+    The season a date falls in (July onwards belongs to the season starting that year).
+    """
+    y = d.year if d.month >= 7 else d.year - 1
+    return f"{y}-{(y + 1) % 100:02d}"
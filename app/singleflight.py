@@ -0,0 +1,33 @@
+from __future__ import annotations
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key: the first caller for a key runs `fn`, everyone who
+    arrives while it is in flight awaits the same result (or exception). Once it settles
+    the key is forgotten, so the next call runs fresh; nothing is cached.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        fut = self._calls.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn())
+            self._calls[key] = fut
+            fut.add_done_callback(lambda f: self._forget(key, f))
+        # shield: one caller giving up (client disconnect, timeout) doesn't cancel the
+        # shared call out from under the others
+        return await asyncio.shield(fut)
+
+    def _forget(self, key: Hashable, fut: asyncio.Future) -> None:
+        if self._calls.get(key) is fut:
+            del self._calls[key]
+        if not fut.cancelled():
+            fut.exception()  # retrieved here so an abandoned failure isn't logged as unhandled
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import threading
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from .models import Team
+
+_PENDING_KEY = "team_index_pending"
+
+
+class TeamIndex:
+    """
+    Process-wide (provider, provider_team_id) -> (Team.id, name) index.
+
+    Loaded once per database, then kept current by ingest. Writes made inside a
+    session are staged on that session and only published after it commits, so a
+    rolled-back insert or rename never leaks into the shared index.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], tuple[int, str]] = {}
+        self._loaded_for: str | None = None
+
+    @staticmethod
+    def _bind_key(db: Session) -> str:
+        return str(db.get_bind().url)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        key = self._bind_key(db)
+        if self._loaded_for == key:
+            return
+        rows = db.execute(select(Team.provider, Team.provider_team_id, Team.id, Team.name)).all()
+        with self._lock:
+            self._entries = {(p, ptid): (tid, name) for p, ptid, tid, name in rows}
+            self._loaded_for = key
+
+    def get(self, db: Session, provider: str, provider_team_id: str) -> tuple[int, str] | None:
+        pending = db.info.get(_PENDING_KEY)
+        if pending and (provider, provider_team_id) in pending:
+            return pending[(provider, provider_team_id)]
+        self._ensure_loaded(db)
+        return self._entries.get((provider, provider_team_id))
+
+    def stage(self, db: Session, provider: str, provider_team_id: str, team_id: int, name: str) -> None:
+        db.info.setdefault(_PENDING_KEY, {})[(provider, provider_team_id)] = (team_id, name)
+
+    def publish(self, db: Session) -> None:
+        pending = db.info.pop(_PENDING_KEY, None)
+        if not pending:
+            return
+        with self._lock:
+            if self._loaded_for == self._bind_key(db):
+                self._entries.update(pending)
+
+    def invalidate(self) -> None:
+        """Drop everything; the next lookup reloads from the database."""
+        with self._lock:
+            self._entries = {}
+            self._loaded_for = None
+
+
+team_index = TeamIndex()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged_teams(session: Session) -> None:
+    team_index.publish(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_teams(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
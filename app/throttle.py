@@ -0,0 +1,105 @@
+from __future__ import annotations
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter: `rate` requests per second on average, with bursts of
+    up to `capacity`. One instance is shared by every caller that should count against
+    the same budget.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Reserve a token up front; a negative balance is the queue ahead of us, so each
+        # caller sleeps exactly until its own token has accrued (FIFO, no lock needed)
+        self._refill()
+        self._tokens -= 1.0
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class CircuitOpenError(Exception):
+    """Upstream is considered down; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; while open every call
+    fails fast. After `reset_timeout` seconds one trial call is let through (half-open):
+    success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raises CircuitOpenError to fail fast; True if this call took the half-open trial slot."""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        raise CircuitOpenError("upstream circuit is open; failing fast")
+
+    def release(self) -> None:
+        """
+        Gives back a half-open trial slot without a verdict (the call was cancelled or
+        failed for a reason that says nothing about upstream), so another call can try.
+        Only for the call that took it (before_call returned True).
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Full-jitter exponential backoff for the given 0-based attempt; never sooner than
+        a server-provided Retry-After.
+        """
+        d = random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            d = max(d, min(retry_after, self.max_delay))
+        return d
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields, replace
+from math import log
+from time import perf_counter
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy.orm import Session
+
+from .elo import DEFAULT_PARAMS, EloParams, expected_score, game_result, replay_elo, season_finals
+
+# Hyperparameter search for the win/loss Elo. Each candidate replays the season in order
+# and is scored on its pregame home-win probabilities:
+#   python -m app.tune --season 2025-26 --random 2000 --workers 8
+#   python -m app.tune --grid k_base=16,20,24 --grid home_advantage=50,65,80
+
+# Ranges sampled by --random
+SEARCH_SPACE: dict[str, tuple[float, float]] = {
+    "k_base": (8.0, 40.0),
+    "home_advantage": (0.0, 120.0),
+    "early_games": (0, 20),
+    "early_mult": (1.0, 2.0),
+    "late_games": (10, 40),
+    "late_mult": (0.5, 1.0),
+}
+_INT_FIELDS = {f.name for f in fields(EloParams) if f.type in ("int", int)}
+
+Games = Sequence[tuple[int, int, float, bool]]
+
+
+def load_games(db: Session, season: str) -> tuple[list[tuple[int, int, float, bool]], int]:
+    """The season's finals in replay order as (home_idx, away_idx, s_home, neutral), and the team count."""
+    index: dict[int, int] = {}
+    games = []
+    for _, _, home_id, away_id, home_score, away_score, neutral_site in season_finals(db, season):
+        h = index.setdefault(home_id, len(index))
+        a = index.setdefault(away_id, len(index))
+        games.append((h, a, game_result(home_score, away_score), bool(neutral_site)))
+    return games, len(index)
+
+
+def evaluate(games: Games, n_teams: int, params: EloParams, burn_in: int = 0) -> dict[str, float]:
+    """
+    Log-loss and Brier score of the pregame home-win probability over the season, in
+    order. Games where either team has fewer than `burn_in` games are not scored (but
+    still update ratings).
+    """
+    trace: list[tuple[float, float, float, float]] = []
+    replay_elo(games, n_teams, params, trace)
+    played = [0] * n_teams
+    ll = brier = 0.0
+    n = 0
+    for (h, a, s_home, neutral), (h_pre, a_pre, _, _) in zip(games, trace):
+        if played[h] >= burn_in and played[a] >= burn_in:
+            p = expected_score(h_pre + (0.0 if neutral else params.home_advantage), a_pre)
+            p = min(max(p, 1e-12), 1.0 - 1e-12)
+            ll -= s_home * log(p) + (1.0 - s_home) * log(1.0 - p)
+            brier += (p - s_home) ** 2
+            n += 1
+        played[h] += 1
+        played[a] += 1
+    return {"log_loss": ll / n if n else 0.0, "brier": brier / n if n else 0.0, "scored": n}
+
+
+def random_params(n: int, seed: int | None = None) -> Iterator[EloParams]:
+    rnd = random.Random(seed)
+    for _ in range(n):
+        values: dict[str, Any] = {}
+        for name, (lo, hi) in SEARCH_SPACE.items():
+            values[name] = rnd.randint(int(lo), int(hi)) if name in _INT_FIELDS else rnd.uniform(lo, hi)
+        values["late_games"] = max(values["late_games"], values["early_games"])
+        yield replace(DEFAULT_PARAMS, **values)
+
+
+def grid_params(grid: dict[str, list[float]]) -> Iterator[EloParams]:
+    names = list(grid)
+    for combo in itertools.product(*(grid[n] for n in names)):
+        values = {n: int(v) if n in _INT_FIELDS else v for n, v in zip(names, combo)}
+        yield replace(DEFAULT_PARAMS, **values)
+
+
+# Worker state: the season is shipped to each process once, not with every candidate
+_games: Games = ()
+_n_teams = 0
+
+
+def _init_worker(games: Games, n_teams: int) -> None:
+    global _games, _n_teams
+    _games, _n_teams = games, n_teams
+
+
+def _evaluate_batch(job: tuple[list[EloParams], int]) -> list[tuple[EloParams, dict[str, float]]]:
+    batch, burn_in = job
+    return [(p, evaluate(_games, _n_teams, p, burn_in)) for p in batch]
+
+
+def tune(
+    games: Games,
+    n_teams: int,
+    candidates: Iterator[EloParams],
+    workers: int = 0,
+    burn_in: int = 0,
+    top: int = 10,
+    batch_size: int = 50,
+) -> dict[str, Any]:
+    """
+    Scores every candidate (plus the current defaults) and returns the best `top` by
+    log-loss. workers > 1 spreads batches of candidates over a process pool.
+    """
+    t0 = perf_counter()
+    batches: list[list[EloParams]] = []
+    for p in candidates:
+        if not batches or len(batches[-1]) >= batch_size:
+            batches.append([])
+        batches[-1].append(p)
+
+    results: list[tuple[EloParams, dict[str, float]]] = []
+    jobs = [(b, burn_in) for b in batches]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(games, n_teams)) as pool:
+            for out in pool.map(_evaluate_batch, jobs):
+                results.extend(out)
+    else:
+        _init_worker(games, n_teams)
+        for job in jobs:
+            results.extend(_evaluate_batch(job))
+
+    results.sort(key=lambda r: r[1]["log_loss"])
+    return {
+        "games": len(games),
+        "evaluated": len(results),
+        "seconds": round(perf_counter() - t0, 3),
+        "baseline": {"params": asdict(DEFAULT_PARAMS), **evaluate(games, n_teams, DEFAULT_PARAMS, burn_in)},
+        "best": [{"params": asdict(p), **score} for p, score in results[:top]],
+    }
+
+
+def _parse_grid(specs: list[str]) -> dict[str, list[float]]:
+    grid: dict[str, list[float]] = {}
+    valid = {f.name for f in fields(EloParams)}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in valid or not values:
+            raise SystemExit(f"bad --grid {spec!r}; expected one of {sorted(valid)} as name=v1,v2,...")
+        grid[name] = [float(v) for v in values.split(",")]
+    return grid
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.tune")
+    parser.add_argument("--season", default="2025-26")
+    parser.add_argument("--random", type=int, default=0, help="sample this many parameter sets")
+    parser.add_argument("--grid", action="append", default=[], help="name=v1,v2,... (repeatable; full product)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=0, help="evaluate in this many processes")
+    parser.add_argument("--burn-in", type=int, default=0, help="don't score games where a team has fewer games")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    if not args.random and not args.grid:
+        parser.error("give --random N and/or --grid name=v1,v2")
+
+    from .db import SessionLocal, init_db
+    init_db()
+    db = SessionLocal()
+    try:
+        games, n_teams = load_games(db, args.season)
+    finally:
+        db.close()
+
+    candidates = itertools.chain(
+        grid_params(_parse_grid(args.grid)) if args.grid else iter(()),
+        random_params(args.random, args.seed),
+    )
+    print(json.dumps(tune(games, n_teams, candidates, args.workers, args.burn_in, args.top)))
+
+
+if __name__ == "__main__":
+    main()